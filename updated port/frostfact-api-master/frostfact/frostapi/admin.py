@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.core.exceptions import ValidationError
+from django.db.models import Case, F, Value, When
 from django.http import JsonResponse
+from django.utils import timezone
+from .caching import invalidate_queryset_caches
 from .models import *
 from .forms import EventDataForm
 
@@ -12,6 +15,19 @@ class CustomMediaMixin:
         }
         js = ('/static/js/admin_spinner.js',)  # Path to your custom JS file
 
+class BulkActionMixin:
+    """
+    Helpers for changelist actions. Like bulk deletes' per-row signals, their invalidations are coalesced
+    into one flush per request by `batched_invalidation_middleware`.
+    """
+
+    def bulk_update_action(self, request, queryset, message, **changes):
+        """Apply `changes` with a single UPDATE; update() sends no signals, so invalidate the rows explicitly."""
+        invalidate_queryset_caches(queryset)
+        updated = queryset.update(**changes)
+        self.message_user(request, message.format(count=updated))
+        return updated
+
 class SingleActiveAdmin(CustomMediaMixin, admin.ModelAdmin):
     """Admin model ensuring only one active entry at a time."""
 
@@ -66,13 +82,14 @@ class ClientProfileAdmin(CustomMediaMixin, admin.ModelAdmin):
     inlines = [ContactFormSubmissionInline, EventDataInline]
 
 @admin.register(ContactFormSubmission)
-class ContactFormSubmissionAdmin(CustomMediaMixin, admin.ModelAdmin):
-    list_display = ('customer_email', 'subject', 'combined_name', 'time_stamp', 'client_profile')
+class ContactFormSubmissionAdmin(BulkActionMixin, CustomMediaMixin, admin.ModelAdmin):
+    list_display = ('customer_email', 'subject', 'combined_name', 'time_stamp', 'client_profile', 'message_read')
     search_fields = ('customer_email', 'subject', 'phone', 'first_name', 'last_name')
     autocomplete_fields = ('client_profile',)
     readonly_fields = ('slug', 'time_stamp', 'csrf_token',)
     ordering = ('-time_stamp',)
-    list_filter = ('client_profile',)
+    list_filter = ('message_read', 'client_profile')
+    actions = ['mark_read', 'mark_unread']
     fields = [
         'customer_email', 'subject', 'client_profile', 'phone', 'first_name', 'last_name',
         'event_date_request', 'message', 'time_stamp', 'slug', 'message_read', 'csrf_token'
@@ -81,21 +98,43 @@ class ContactFormSubmissionAdmin(CustomMediaMixin, admin.ModelAdmin):
     def combined_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
 
+    @admin.action(description="Mark selected submissions as read")
+    def mark_read(self, request, queryset):
+        self.bulk_update_action(request, queryset.filter(message_read=False), "{count} submission(s) marked as read.",
+                                message_read=True)
+
+    @admin.action(description="Mark selected submissions as unread")
+    def mark_unread(self, request, queryset):
+        self.bulk_update_action(request, queryset.filter(message_read=True), "{count} submission(s) marked as unread.",
+                                message_read=False)
+
 @admin.register(EventData)
-class EventDataAdmin(CustomMediaMixin, admin.ModelAdmin):
+class EventDataAdmin(BulkActionMixin, CustomMediaMixin, admin.ModelAdmin):
     form = EventDataForm
     list_display = (
         'event_name', 'event_genre', 'event_date', 'event_type', 'event_host', 'event_image', 'client_profile',
-        'recurring', 'artist_name', 'artist_instagram', 'artist_spotify', 'artist_youtube', 'artist_facebook'
+        'recurring', 'archived', 'artist_name', 'artist_instagram', 'artist_spotify', 'artist_youtube', 'artist_facebook'
     )
+    list_filter = ('archived', 'event_type')
     search_fields = ['event_name', 'client_profile__client_business', 'event_month', 'event_host', 'event_genre',
                      'recurring']
     readonly_fields = ('slug', 'event_month')
     fields = (
         'event_name', 'event_date', 'event_time', 'event_type', 'event_genre', 'event_host', 'recurring',
-        'event_image', 'artist_name', 'artist_instagram', 'artist_spotify', 'artist_youtube', 'artist_facebook',
-        'client_profile',
+        'recurrence_rule', 'recurrence_exceptions', 'event_image', 'artist_name', 'artist_instagram', 'artist_spotify', 'artist_youtube', 'artist_facebook',
+        'client_profile', 'archived',
     )
+    actions = ['archive_past_events', 'unarchive_events']
+
+    @admin.action(description="Archive selected past events")
+    def archive_past_events(self, request, queryset):
+        # Recurring events keep producing dates, so only one-off events in the past are archived
+        past = queryset.filter(archived=False, event_date__lt=timezone.localdate()).exclude(recurrence_rule__gt='')
+        self.bulk_update_action(request, past, "{count} past event(s) archived.", archived=True)
+
+    @admin.action(description="Unarchive selected events")
+    def unarchive_events(self, request, queryset):
+        self.bulk_update_action(request, queryset.filter(archived=True), "{count} event(s) unarchived.", archived=False)
 
     def save_model(self, request, obj, form, change):
         try:
@@ -116,14 +155,28 @@ class PolicyDataAdmin(CustomMediaMixin, admin.ModelAdmin):
     search_fields = ('policy_title', 'policy_descrip')
 
 @admin.register(GalleryData)
-class GalleryDataAdmin(CustomMediaMixin, admin.ModelAdmin):
+class GalleryDataAdmin(BulkActionMixin, CustomMediaMixin, admin.ModelAdmin):
     list_display = ('gallery_media_title', 'gallery_media_description', 'gallery_media_image', 'gallery_media_date',
                     'gallery_media_type', 'gallery_position')
+    list_filter = ('gallery_position', 'gallery_media_type')
     search_fields = ('gallery_media_title', 'gallery_media_description', 'gallery_position')
     fields = (
         'gallery_media_title', 'gallery_media_description', 'gallery_media_image', 'gallery_media_video',
         'gallery_media_type', 'gallery_position',
     )
+    actions = ['toggle_position']
+
+    @admin.action(description="Move selected media to the other slider")
+    def toggle_position(self, request, queryset):
+        top, bottom = GalleryData.EventChoices.SLIDER_TOP, GalleryData.EventChoices.SLIDER_BOTTOM
+        self.bulk_update_action(
+            request, queryset, "{count} gallery item(s) moved to the other slider.",
+            gallery_position=Case(
+                When(gallery_position=top, then=Value(bottom)),
+                When(gallery_position=bottom, then=Value(top)),
+                default=F('gallery_position'),
+            ),
+        )
 
 @admin.register(TextSliderTop)
 class SliderTopAdmin(SingleActiveAdmin):
@@ -134,3 +187,24 @@ class SliderTopAdmin(SingleActiveAdmin):
 class SliderBottomAdmin(SingleActiveAdmin):
     list_display = ('bottom_slider_title', 'bottom_slider_text', 'active_text')
     active_field = 'active_text'
+
+@admin.register(ImageJob)
+class ImageJobAdmin(CustomMediaMixin, admin.ModelAdmin):
+    list_display = ('content_type', 'object_id', 'source_name', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'content_type')
+    readonly_fields = ('content_type', 'object_id', 'source_name', 'attempts', 'last_error', 'created_at', 'updated_at')
+
+
+@admin.register(StagedContactSubmission)
+class StagedContactSubmissionAdmin(CustomMediaMixin, admin.ModelAdmin):
+    list_display = ('pk', 'status', 'attempts', 'created_at', 'updated_at')
+    list_filter = ('status',)
+    readonly_fields = ('payload', 'csrf_token', 'attempts', 'last_error', 'created_at', 'updated_at')
+
+
+@admin.register(EmailNotification)
+class EmailNotificationAdmin(CustomMediaMixin, admin.ModelAdmin):
+    list_display = ('recipient', 'kind', 'subject', 'status', 'attempts', 'run_after', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('recipient', 'subject')
+    readonly_fields = ('submission', 'attempts', 'last_error', 'created_at', 'updated_at', 'sent_at')
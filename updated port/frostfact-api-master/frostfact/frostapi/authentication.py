@@ -1,15 +1,53 @@
-# yourapp/authentication.py
-from rest_framework.authentication import BaseAuthentication
-from rest_framework.exceptions import AuthenticationFailed
-from django.conf import settings
+import hashlib
+import hmac
+import logging
+from base64 import b64decode
 
-# authentication.py (create this file in your app directory)
+from django.conf import settings
+from django.contrib.auth.models import User
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from base64 import b64decode
-from django.contrib.auth.models import User
+
+from .caching import LocalCache
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialCache(LocalCache):
+    """
+    Bounded, short-lived, per-process cache of Basic credentials that already passed `check_password`.
+
+    Entries are keyed by an HMAC of the raw Authorization header, so plaintext passwords are never kept.
+    Each entry remembers the password hash it was verified against; a hit is only honoured while the
+    user's current hash still matches and the account is active, which covers password changes and
+    deactivation made from any process.
+    """
+
+    @staticmethod
+    def make_key(auth_header):
+        return hmac.new(settings.SECRET_KEY.encode('utf-8'), auth_header.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def remember(self, key, user):
+        """Cache `(user_id, password_hash)` for a verified header."""
+        self.set(key, (user.pk, user.password))
+
+    def invalidate_user(self, user_id):
+        """Drop every cached credential belonging to `user_id`."""
+        self.delete_where(lambda entry: entry[0] == user_id)
+
+
+credential_cache = CredentialCache(
+    maxsize=getattr(settings, 'AUTH_CACHE_MAXSIZE', 256),
+    ttl=getattr(settings, 'AUTH_CACHE_TTL', 300),
+)
+
 
 class CustomHeaderAuthentication(BaseAuthentication):
+    """Basic auth for the API, hashing each distinct credential at most once per cache lifetime."""
+
+    def authenticate_header(self, request):
+        return 'Basic realm="api"'
+
     def authenticate(self, request):
         auth_header = request.headers.get('Authorization')
         if not auth_header:
@@ -18,15 +56,29 @@ class CustomHeaderAuthentication(BaseAuthentication):
         if not auth_header.startswith('Basic '):
             return None
 
-        encoded_credentials = auth_header.split(' ')[1]
-        decoded_credentials = b64decode(encoded_credentials).decode('utf-8')
-        username, password = decoded_credentials.split(':')
+        cache_key = credential_cache.make_key(auth_header)
+        cached = credential_cache.get(cache_key)
+        if cached is not None:
+            user_id, password_hash = cached
+            user = User.objects.filter(pk=user_id).first()
+            if user is not None and user.is_active and user.password == password_hash:
+                return (user, None)
+            credential_cache.delete(cache_key)
+
+        try:
+            encoded_credentials = auth_header.split(' ', 1)[1]
+            decoded_credentials = b64decode(encoded_credentials).decode('utf-8')
+            username, password = decoded_credentials.split(':', 1)
+        except (ValueError, IndexError) as e:
+            logger.error(f"Error decoding credentials: {e}")
+            raise AuthenticationFailed('Invalid or malformed credentials provided.')
 
         try:
             user = User.objects.get(username=username)
-            if not user.check_password(password):
+            if not user.is_active or not user.check_password(password):
                 raise AuthenticationFailed('Invalid username/password')
         except User.DoesNotExist:
             raise AuthenticationFailed('Invalid username/password')
 
+        credential_cache.remember(cache_key, user)
         return (user, None)
@@ -0,0 +1,500 @@
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = getattr(settings, 'CACHE_TTL', 60 * 60 * 24)
+EMPTY_CACHE_TTL = getattr(settings, 'EMPTY_CACHE_TTL', 60 * 5)  # Empty results: cached, but re-checked sooner
+CACHE_LOCK_LEASE = getattr(settings, 'CACHE_LOCK_LEASE', 10)  # Seconds a recompute lock is held at most
+CACHE_LOCK_WAIT = getattr(settings, 'CACHE_LOCK_WAIT', 2)  # Seconds a request waits for another's recompute
+CACHE_EARLY_EXPIRY_BETA = getattr(settings, 'CACHE_EARLY_EXPIRY_BETA', 1.0)
+
+# Which cached collections (a view's `cache_key_prefix`) each model's rows end up in. A write to a model
+# invalidates every collection listed for it by bumping their version stamps, so responses for all
+# variants (detail slugs, date windows, pages, orderings) go stale at once without enumerating keys.
+CACHE_DEPENDENCIES = {
+    'frostapi.ContactFormSubmission': ('contact_form', 'client_data'),
+    'frostapi.EventData': ('event_data', 'event_occurrences', 'client_data'),
+    'frostapi.EventOccurrence': ('event_occurrences',),
+    'frostapi.ClientProfile': ('client_data',),
+    'frostapi.FAQData': ('faq_data',),
+    'frostapi.PolicyData': ('policy_data',),
+    'frostapi.TextSliderTop': ('text_slider_top',),
+    'frostapi.TextSliderBottom': ('text_slider_bottom',),
+    'frostapi.HeroImage': ('hero_image',),
+    'frostapi.GalleryData': ('gallery_data',),
+}
+
+# Detail responses are versioned per object. For each model: the `(collection, attribute)` pairs naming
+# the objects whose detail pages render its rows, e.g. a contact form also appears on its client's page.
+OBJECT_DEPENDENCIES = {
+    'frostapi.ContactFormSubmission': (('contact_form', 'pk'), ('client_data', 'client_profile_id')),
+    'frostapi.EventData': (('event_data', 'pk'), ('client_data', 'client_profile_id')),
+    'frostapi.ClientProfile': (('client_data', 'pk'),),
+    'frostapi.GalleryData': (('gallery_data', 'pk'),),
+}
+
+
+class LocalCache:
+    """
+    Bounded per-process LRU with per-entry expiry: the first tier in front of the shared cache, and the
+    base of the credential cache.
+
+    Nothing here is shared between gunicorn workers; entries are only safe to keep locally when their
+    key already pins the data (e.g. a response key containing the collection version) or when a short
+    TTL bounds how stale they can be.
+    """
+
+    def __init__(self, maxsize=256, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose value satisfies `predicate`."""
+        with self._lock:
+            for key in [key for key, (value, _) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Rendered responses of hot collections, keyed by version so a local entry can never be stale
+local_response_cache = LocalCache(maxsize=getattr(settings, 'LOCAL_CACHE_MAXSIZE', 256), ttl=RESPONSE_CACHE_TTL)
+# Version stamps seen by this worker. Writes in this process update it at once; writes in other workers
+# are picked up within LOCAL_CACHE_VERSION_TTL seconds.
+local_version_cache = LocalCache(maxsize=128, ttl=getattr(settings, 'LOCAL_CACHE_VERSION_TTL', 2))
+
+
+# Invalidations being collected by this thread: `pending` for a batched_invalidation() block, `on_commit`
+# for the open transaction
+_batch = threading.local()
+
+
+def clear_local_caches():
+    """Reset this process's cache state, including invalidations still waiting for a commit."""
+    local_response_cache.clear()
+    local_version_cache.clear()
+    _batch.pending = _batch.on_commit = None
+
+
+def get_version_key(prefix):
+    """Key holding the version stamp of a cached collection."""
+    return f'{prefix}_version'
+
+
+def _new_version():
+    # Microseconds since the epoch: unique per bump and doubles as a modification time.
+    return time.time_ns() // 1000
+
+
+def get_collection_version(prefix, local=False):
+    """Current version stamp of a collection, created on first use. `local` reads through the worker's memo."""
+    key = get_version_key(prefix)
+    if local:
+        version = local_version_cache.get(key)
+        if version is not None:
+            return version
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key) or version
+    local_version_cache.set(key, version)
+    return version
+
+
+def bump_collection_version(prefix):
+    """Stamp a collection with a new version so cached responses and client ETags go stale."""
+    version = _new_version()
+    cache.set(get_version_key(prefix), version, timeout=None)
+    local_version_cache.set(get_version_key(prefix), version)
+    return version
+
+
+def get_queryset_cache_key(prefix):
+    """Key of the cached instance list `CacheMixin` keeps for a collection."""
+    return f'{prefix}_queryset'
+
+
+def get_dependent_collections(model):
+    """Collections whose cached responses include rows of `model`."""
+    return CACHE_DEPENDENCIES.get(model._meta.label, ())
+
+
+def get_object_prefix(prefix, pk):
+    """Version namespace of one object's detail responses within collection `prefix`."""
+    return f'{prefix}_object_{pk}'
+
+
+def get_slug_cache_key(prefix, slug):
+    """Key of the shared slug → pk entry for a detail route."""
+    return f'{prefix}_slug_{slug}'
+
+
+def get_dependent_objects(instance):
+    """Object prefixes whose detail responses render `instance`."""
+    dependents = OBJECT_DEPENDENCIES.get(instance._meta.label, ())
+    return [
+        get_object_prefix(prefix, getattr(instance, attr))
+        for prefix, attr in dependents if getattr(instance, attr) is not None
+    ]
+
+
+def invalidate_collections(prefixes, object_prefixes=(), delete_keys=()):
+    """
+    Bump the versions of `prefixes` and `object_prefixes` and drop the collections' cached instance lists
+    (plus any `delete_keys`): two cache round trips in total.
+    """
+    if not prefixes and not object_prefixes:
+        return None
+    version = _new_version()
+    version_keys = [get_version_key(prefix) for prefix in (*prefixes, *object_prefixes)]
+    cache.set_many({key: version for key in version_keys}, timeout=None)
+    cache.delete_many([get_queryset_cache_key(prefix) for prefix in prefixes] + list(delete_keys))
+    for key in version_keys:
+        local_version_cache.set(key, version)
+    return version
+
+
+class PendingInvalidation:
+    """Invalidations collected for later: de-duplicated, then applied once with a single `invalidate_collections()`."""
+
+    def __init__(self):
+        self.prefixes, self.object_prefixes, self.delete_keys = set(), set(), set()
+        self.flushed = False
+
+    def add(self, prefixes, object_prefixes=(), delete_keys=()):
+        self.prefixes.update(prefixes)
+        self.object_prefixes.update(object_prefixes)
+        self.delete_keys.update(delete_keys)
+
+    def flush(self):
+        if self.flushed:
+            return None
+        self.flushed = True
+        return invalidate_collections(sorted(self.prefixes), sorted(self.object_prefixes), sorted(self.delete_keys))
+
+
+def defer_until_commit(prefixes, object_prefixes=(), delete_keys=()):
+    """
+    Add to the batch flushed when the open transaction commits.
+
+    Every addition registers the batch's flush with `on_commit`: the first one to run applies the whole
+    batch and the rest are no-ops. A rollback does not drop keys: Django discards the rolled-back
+    callbacks, but the keys stay in this thread's batch and are applied by the next flush, whether a
+    callback registered outside the rolled-back savepoint or the next committed transaction. That only
+    costs a spare invalidation, never a missed one.
+    """
+    pending = getattr(_batch, 'on_commit', None)
+    if pending is None or pending.flushed:
+        pending = _batch.on_commit = PendingInvalidation()
+    pending.add(prefixes, object_prefixes, delete_keys)
+    transaction.on_commit(pending.flush)
+
+
+def queue_invalidation(prefixes, object_prefixes=(), delete_keys=()):
+    """
+    Invalidate now, or add to the enclosing `batched_invalidation()` block or open transaction.
+
+    Deferring to the commit also keeps a concurrent request from re-caching the old rows between
+    the invalidation and the commit.
+    """
+    pending = getattr(_batch, 'pending', None)
+    if pending is not None:
+        pending.add(prefixes, object_prefixes, delete_keys)
+    elif transaction.get_connection().in_atomic_block:
+        defer_until_commit(prefixes, object_prefixes, delete_keys)
+    else:
+        return invalidate_collections(prefixes, object_prefixes, delete_keys)
+    return None
+
+
+@contextmanager
+def batched_invalidation():
+    """
+    Collect every invalidation made inside the block (signals included) and apply them together on exit,
+    so a bulk action over N rows costs one set_many/delete_many instead of N. Nested blocks join the outer one.
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        yield
+        return
+    pending = _batch.pending = PendingInvalidation()
+    try:
+        yield
+    finally:
+        _batch.pending = None
+        if transaction.get_connection().in_atomic_block:
+            defer_until_commit(pending.prefixes, pending.object_prefixes, pending.delete_keys)
+        else:
+            pending.flush()
+
+
+def batched_invalidation_middleware(get_response):
+    """Coalesce the cache invalidations of a whole request into one flush at the end of it."""
+    def middleware(request):
+        with batched_invalidation():
+            return get_response(request)
+    return middleware
+
+
+def invalidate_instance_caches(instance, deleted=False):
+    """Invalidate the collections and detail responses that render `instance`; forget its slug once deleted."""
+    prefixes = get_dependent_collections(type(instance))
+    delete_keys = []
+    if deleted and getattr(instance, 'slug', None):
+        delete_keys = [get_slug_cache_key(prefix, instance.slug) for prefix in prefixes]
+    return queue_invalidation(prefixes, get_dependent_objects(instance), delete_keys)
+
+
+def get_queryset_dependent_objects(queryset):
+    """Object prefixes whose detail responses render the rows of `queryset`: one query, none without dependents."""
+    dependents = OBJECT_DEPENDENCIES.get(queryset.model._meta.label, ())
+    object_prefixes = set()
+    if dependents:
+        for row in queryset.values(*{attr for _, attr in dependents}):
+            object_prefixes.update(
+                get_object_prefix(prefix, row[attr]) for prefix, attr in dependents if row[attr] is not None
+            )
+    return sorted(object_prefixes)
+
+
+def invalidate_queryset_caches(queryset):
+    """
+    Invalidate everything rendering the rows of `queryset`, for writes such as update() that send no signals.
+    Reads the rows' dependent object ids in one query, so call it before the write if that changes them.
+    """
+    return queue_invalidation(get_dependent_collections(queryset.model), get_queryset_dependent_objects(queryset))
+
+
+def invalidate_model_caches(model):
+    """
+    Invalidate everything that depends on `model`, detail pages of all its rows included, e.g. after bulk
+    writes that skip post_save.
+    """
+    return invalidate_collections(
+        get_dependent_collections(model), get_queryset_dependent_objects(model._default_manager.all())
+    )
+
+
+def version_last_modified(version):
+    """Version stamp as a Unix timestamp in seconds, for Last-Modified/If-Modified-Since."""
+    return version // 1_000_000
+
+
+def make_etag(prefix, version, variant=''):
+    """Weak ETag derived from the collection version and the requested variant, not from the body."""
+    digest = hashlib.md5(f'{prefix}:{version}:{variant}'.encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def get_response_cache_key(prefix, version, variant=''):
+    """Key for a rendered response of `prefix` at a given collection version."""
+    variant_hash = hashlib.md5(variant.encode('utf-8')).hexdigest()
+    return f'{prefix}_response_{version}_{variant_hash}'
+
+
+def is_empty_data(data):
+    """True for an empty list or an empty page of results."""
+    if isinstance(data, dict) and 'results' in data:
+        return not data['results']
+    return not data
+
+
+def render_payload(data, etag, last_modified):
+    """Render serializer data once and keep the bytes alongside their validators."""
+    return {
+        'body': JSONRenderer().render(data),
+        'etag': etag,
+        'last_modified': last_modified,
+        'content_type': 'application/json',
+        'empty': is_empty_data(data),
+    }
+
+
+def get_payload_timeout(payload):
+    return EMPTY_CACHE_TTL if payload.get('empty') else RESPONSE_CACHE_TTL
+
+
+def build_response(payload, status=200):
+    """Turn a cached payload back into an HTTP response without touching a serializer."""
+    response = HttpResponse(payload['body'], content_type=payload['content_type'], status=status)
+    response['ETag'] = payload['etag']
+    response['Last-Modified'] = http_date(payload['last_modified'])
+    response['Content-Length'] = str(len(payload['body']))
+    return response
+
+
+def get_not_modified_response(request, etag, last_modified):
+    """Answer If-None-Match/If-Modified-Since with a 304 when the client's copy is current."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def should_refresh_early(entry, beta=CACHE_EARLY_EXPIRY_BETA):
+    """
+    Probabilistic early expiry ("XFetch"): the closer an entry is to expiring and the longer it took to
+    compute, the likelier a reader volunteers to refresh it, so expiry does not hit every reader at once.
+    """
+    return time.time() - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expires_at']
+
+
+def acquire_lock(lock_key, lease=CACHE_LOCK_LEASE):
+    """
+    Single-flight lock: True for the one caller allowed to recompute. Fails open if the cache is down,
+    including with IGNORE_EXCEPTIONS, where django-redis swallows the error and add() returns None.
+    """
+    try:
+        return cache.add(lock_key, 1, timeout=lease) is not False
+    except Exception as e:
+        logger.error(f"Error acquiring cache lock {lock_key}: {e}")
+        return True
+
+
+def release_lock(lock_key):
+    try:
+        cache.delete(lock_key)
+    except Exception as e:
+        logger.error(f"Error releasing cache lock {lock_key}: {e}")
+
+
+def read_entry(cache_key, local=False):
+    """Cached entry written by `compute_entry`; values in any older format count as a miss."""
+    entry = get_cached_payload(cache_key, local=local)
+    if isinstance(entry, dict) and 'expires_at' in entry:
+        return entry
+    return None
+
+
+def compute_entry(cache_key, compute, timeout, stale_key=None, local=False):
+    """
+    Run `compute` and store its result, with the metadata early expiry needs, under the key and stale key.
+    `timeout` is in seconds, or a callable deciding it from the computed value (e.g. shorter for empty results).
+    """
+    started = time.time()
+    value = compute()
+    if callable(timeout):
+        timeout = timeout(value)
+    entry = {'value': value, 'delta': time.time() - started, 'expires_at': time.time() + timeout}
+    set_cached_payload(cache_key, entry, timeout=timeout, local=local)
+    if stale_key:
+        set_cached_payload(stale_key, entry, timeout=timeout)
+    return value
+
+
+def get_or_compute(cache_key, compute, timeout=RESPONSE_CACHE_TTL, stale_key=None, local=False):
+    """
+    Read-through cache that never lets a miss fan out into N identical recomputes.
+
+    Only the holder of a short-lived lock recomputes; everyone else keeps serving the current value (early
+    refresh), the last value stored under `stale_key` (after an invalidation), or waits up to
+    CACHE_LOCK_WAIT seconds for the holder to finish before computing as a last resort.
+    """
+    entry = read_entry(cache_key, local=local)
+    if entry is not None and not should_refresh_early(entry):
+        return entry['value']
+
+    lock_key = f'{cache_key}_lock'
+    if acquire_lock(lock_key):
+        try:
+            return compute_entry(cache_key, compute, timeout, stale_key, local)
+        finally:
+            release_lock(lock_key)
+
+    if entry is not None:
+        return entry['value']
+    if stale_key:
+        stale = read_entry(stale_key)
+        if stale is not None:
+            logger.info(f"Serving stale value for {cache_key} while it is recomputed")
+            return stale['value']
+
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = read_entry(cache_key, local=local)
+        if entry is not None:
+            return entry['value']
+    logger.warning(f"Gave up waiting for the recompute of {cache_key}")
+    return compute_entry(cache_key, compute, timeout, stale_key, local)
+
+
+def get_cached_payload(cache_key, local=False):
+    """Cached response payload; with `local`, check this worker's LRU before the shared cache."""
+    if local:
+        payload = local_response_cache.get(cache_key)
+        if payload is not None:
+            return payload
+    try:
+        payload = cache.get(cache_key)
+    except Exception as e:
+        logger.error(f"Error reading response cache for key {cache_key}: {e}")
+        return None
+    if local and payload is not None:
+        local_response_cache.set(cache_key, payload)
+    return payload
+
+
+def set_cached_payload(cache_key, payload, timeout=RESPONSE_CACHE_TTL, local=False):
+    if local:
+        local_response_cache.set(cache_key, payload, ttl=timeout)
+    try:
+        cache.set(cache_key, payload, timeout=timeout)
+    except Exception as e:
+        logger.error(f"Error writing response cache for key {cache_key}: {e}")
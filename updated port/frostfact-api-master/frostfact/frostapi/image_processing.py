@@ -0,0 +1,181 @@
+import hashlib
+import logging
+from io import BytesIO
+
+from PIL import Image
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import ImageJob, ImageStatusChoices
+from .queues import claim_batch, schedule_retry
+from .storage import upload_buffer
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'IMAGE_JOB_MAX_ATTEMPTS', 5)
+RETRY_BACKOFF_SECONDS = getattr(settings, 'IMAGE_JOB_RETRY_BACKOFF', 30)
+
+
+IMAGE_FORMATS = {
+    # format: (Pillow encoder, file extension, content type, encoder options)
+    'avif': ('AVIF', 'avif', 'image/avif', {'quality': 60}),
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 85, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+
+def get_derivative_formats():
+    """Configured derivative formats that the installed Pillow can actually encode."""
+    Image.init()
+    formats = [fmt for fmt in settings.IMAGE_DERIVATIVE_FORMATS if IMAGE_FORMATS[fmt][0] in Image.SAVE]
+    return formats or ['webp']
+
+
+def get_derivative_widths(source_size, widths, primary_height):
+    """Width ladder for one source: configured widths plus the primary rendition, never upscaled."""
+    source_width, source_height = source_size
+    primary_width = int(primary_height * source_width / source_height)
+    ladder = {w for w in widths if w < source_width} | {min(primary_width, source_width)}
+    return sorted(ladder), min(primary_width, source_width)
+
+
+def render_derivatives(source_bytes, widths, primary_height, formats):
+    """
+    Decode the source once and encode every (width, format) rendition.
+
+    Pure function of its arguments so it can run in a worker process. Returns the source size, the primary
+    width and a list of `(rendition, buffer)` where `rendition` is the metadata later stored on the model.
+    """
+    img = Image.open(BytesIO(source_bytes))
+    img.load()
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+
+    ladder, primary_width = get_derivative_widths(img.size, widths, primary_height)
+    renditions = []
+    for width in ladder:
+        height = max(1, round(img.height * width / img.width))
+        resized = img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            encoder, ext, content_type, options = IMAGE_FORMATS[fmt]
+            frame = resized.convert("RGB") if encoder == 'JPEG' else resized
+            buffer = BytesIO()
+            frame.save(buffer, format=encoder, **options)
+            renditions.append(({
+                'format': fmt,
+                'width': width,
+                'height': height,
+                'ext': ext,
+                'content_type': content_type,
+            }, buffer))
+    return img.size, primary_width, renditions
+
+
+def get_derivative_key(buffer, ext):
+    """Content-addressed key: identical renditions share one object and never need overwriting."""
+    digest = hashlib.sha256(buffer.getbuffer()).hexdigest()
+    return f"derivatives/{digest[:2]}/{digest}.{ext}"
+
+
+def store_derivative(storage, rendition, buffer):
+    """Upload one encoded rendition from its buffer, skipping objects that already exist."""
+    key = get_derivative_key(buffer, rendition['ext'])
+    if not storage.exists(key):
+        key = upload_buffer(storage, key, buffer, rendition['content_type'])
+    return key
+
+
+def generate_image_derivatives(instance, image_field):
+    """
+    Build the responsive rendition ladder for `image_field` and store every rendition.
+
+    Returns `(primary_key, derivatives)`: the WebP rendition at the model's `image_height` for the image field
+    itself, and the metadata list kept in `image_derivatives` for srcset.
+    """
+    with image_field.open('rb') as source:
+        source_bytes = source.read()
+    formats = get_derivative_formats()
+    _, primary_width, renditions = render_derivatives(
+        source_bytes, instance.get_image_widths(), instance.image_height, formats
+    )
+
+    primary_key = None
+    derivatives = []
+    for rendition, buffer in renditions:
+        key = store_derivative(image_field.storage, rendition, buffer)
+        derivatives.append({k: rendition[k] for k in ('format', 'width', 'height')} | {'key': key})
+        if rendition['width'] == primary_width and rendition['format'] == 'webp':
+            primary_key = key
+    if primary_key is None:
+        primary_key = derivatives[-1]['key']
+    logger.info(f"Processed image '{image_field.name}' for '{instance}' into {len(derivatives)} renditions")
+    return primary_key, derivatives
+
+
+def claim_image_jobs(limit=10):
+    """Claim up to `limit` due jobs, plus jobs a crashed worker left processing past their lease."""
+    return claim_batch(
+        ImageJob, limit, due=Q(run_after__lte=timezone.now()), order_by=('run_after',),
+        select_related=('content_type',), max_attempts=MAX_ATTEMPTS, on_abandon=fail_abandoned_jobs,
+    )
+
+
+def fail_abandoned_jobs(jobs):
+    """Jobs whose worker died on the last attempt: fail their rows too, so they don't stay processing."""
+    for job in jobs:
+        _set_image_state(job.content_type.model_class(), job.object_id, job.source_name,
+                         image_status=ImageStatusChoices.FAILED)
+
+
+def _set_image_state(model, pk, source_name, **fields):
+    """Update the owning row with a queryset update (no save() re-run) and fire post_save for cache invalidation."""
+    updated = model.objects.filter(pk=pk, image_original=source_name).update(**fields)
+    if updated:
+        instance = model.objects.get(pk=pk)
+        post_save.send(sender=model, instance=instance, created=False, update_fields=list(fields), raw=False,
+                       using=instance._state.db)
+    return updated
+
+
+def process_image_job(job):
+    """Run one claimed job: render the stored original's derivatives and swap the primary key into the image field."""
+    model = job.content_type.model_class()
+    instance = model.objects.filter(pk=job.object_id).first()
+    if instance is None or instance.image_original != job.source_name:
+        # Row deleted or a newer upload superseded this one; its own job will handle it
+        job.status = ImageJob.StatusChoices.DONE
+        job.save(update_fields=['status', 'updated_at'])
+        return None
+
+    model.objects.filter(pk=instance.pk).update(image_status=ImageStatusChoices.PROCESSING)
+    try:
+        # Always derive from the stored original, never from a previously processed image
+        field = getattr(instance, instance.image_field_name)
+        field.name = job.source_name
+        key, derivatives = generate_image_derivatives(instance, field)
+    except Exception as e:
+        logger.error(f"Image job {job.pk} failed on attempt {job.attempts}: {e}")
+        if schedule_retry(job, e, MAX_ATTEMPTS, RETRY_BACKOFF_SECONDS):
+            model.objects.filter(pk=instance.pk).update(image_status=ImageStatusChoices.PENDING)
+        else:
+            _set_image_state(model, instance.pk, job.source_name, image_status=ImageStatusChoices.FAILED)
+        job.save(update_fields=['status', 'last_error', 'run_after', 'updated_at'])
+        return None
+
+    _set_image_state(model, instance.pk, job.source_name,
+                     **{instance.image_field_name: key, 'image_derivatives': derivatives,
+                        'image_status': ImageStatusChoices.READY})
+    job.status = ImageJob.StatusChoices.DONE
+    job.last_error = None
+    job.save(update_fields=['status', 'last_error', 'updated_at'])
+    return key
+
+
+def run_image_jobs(limit=10):
+    """Claim and process one batch of due jobs. Returns the number of jobs handled."""
+    jobs = claim_image_jobs(limit)
+    for job in jobs:
+        process_image_job(job)
+    return len(jobs)
@@ -0,0 +1,126 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .caching import get_dependent_collections, get_dependent_objects, invalidate_collections
+from .models import ClientProfile, ContactFormSubmission, StagedContactSubmission, allocate_unique_slugs
+from .notifications import enqueue_submission_notifications
+from .queues import claim_batch, schedule_retry
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'CONTACT_INGEST_MAX_ATTEMPTS', 5)
+# Set by the worker or kept in their own column rather than taken from the posted data
+NON_PAYLOAD_FIELDS = {'csrf_token', 'slug'}
+
+
+def stage_contact_submission(validated_data, csrf_token=None):
+    """Queue a validated submission with a single insert. Relations are stored by id so the payload is plain JSON."""
+    payload = {}
+    for name, value in validated_data.items():
+        if name in NON_PAYLOAD_FIELDS:
+            continue
+        field = ContactFormSubmission._meta.get_field(name)
+        if field.is_relation:
+            payload[field.attname] = value.pk if value is not None else None
+        else:
+            payload[name] = value
+    return StagedContactSubmission.objects.create(payload=payload, csrf_token=csrf_token)
+
+
+def claim_staged_submissions(limit=100):
+    """Claim up to `limit` pending rows, plus rows a crashed worker left processing past their lease."""
+    return claim_batch(StagedContactSubmission, limit, order_by=('created_at',), max_attempts=MAX_ATTEMPTS)
+
+
+def link_client_profiles(submissions):
+    """
+    Point every unlinked submission at the client profile for its email, creating missing profiles.
+    One query for existing profiles, one prefix query for slugs, one bulk insert and one re-read.
+    """
+    unlinked = [s for s in submissions if s.client_profile_id is None and s.customer_email]
+    emails = {s.customer_email for s in unlinked}
+    if not emails:
+        return 0
+    profiles = dict(ClientProfile.objects.filter(client_email__in=emails).values_list('client_email', 'pk'))
+
+    new_profiles = {}
+    for submission in unlinked:
+        if submission.customer_email not in profiles and submission.customer_email not in new_profiles:
+            new_profiles[submission.customer_email] = ClientProfile(
+                client_email=submission.customer_email,
+                client_first_name=submission.first_name,
+                client_last_name=submission.last_name,
+                client_phone=submission.phone,
+            )
+    if new_profiles:
+        created = list(new_profiles.values())
+        slugs = allocate_unique_slugs(ClientProfile, [profile.get_slug_source() for profile in created])
+        for profile, slug in zip(created, slugs):
+            profile.slug = slug
+        # A profile created concurrently for the same email wins; the re-read below picks it up
+        ClientProfile.objects.bulk_create(created, ignore_conflicts=True)
+        profiles.update(ClientProfile.objects.filter(client_email__in=new_profiles).values_list('client_email', 'pk'))
+
+    for submission in unlinked:
+        submission.client_profile_id = profiles.get(submission.customer_email)
+    return len(new_profiles)
+
+
+def insert_staged(staged):
+    """
+    Create the submissions for `staged` and delete those rows in one transaction.
+    Returns the created submissions and the number of client profiles created.
+    """
+    submissions = [ContactFormSubmission(**{**row.payload, 'csrf_token': row.csrf_token}) for row in staged]
+    with transaction.atomic():
+        profiles_created = link_client_profiles(submissions)
+        slugs = allocate_unique_slugs(ContactFormSubmission, [s.get_slug_source() for s in submissions])
+        for submission, slug in zip(submissions, slugs):
+            submission.slug = slug
+        ContactFormSubmission.objects.bulk_create(submissions)
+        enqueue_submission_notifications(submissions)
+        StagedContactSubmission.objects.filter(pk__in=[row.pk for row in staged]).delete()
+    return submissions, profiles_created
+
+
+def ingest_staged_submissions(limit=100):
+    """
+    Turn one batch of staged rows into contact form submissions with a single bulk insert.
+
+    If the batch fails, its rows are inserted one at a time so a single bad row only retries (and
+    eventually fails) itself. bulk_create skips save() and post_save, so slugs and profile links are
+    assigned here and the dependent collections and client detail pages are invalidated once for the
+    whole batch. Returns the number of rows handled.
+    """
+    staged = claim_staged_submissions(limit)
+    if not staged:
+        return 0
+
+    try:
+        ingested, profiles_created = insert_staged(staged)
+    except Exception as e:
+        logger.warning(f"Batch of {len(staged)} staged submission(s) failed, inserting one by one: {e}")
+        ingested, profiles_created = [], 0
+        failed = []
+        for row in staged:
+            try:
+                submissions, created = insert_staged([row])
+                ingested += submissions
+                profiles_created += created
+            except Exception as e:
+                logger.error(f"Staged submission {row.pk} failed on attempt {row.attempts}: {e}")
+                schedule_retry(row, e, MAX_ATTEMPTS)
+                failed.append(row)
+        StagedContactSubmission.objects.bulk_update(failed, ['status', 'last_error'])
+
+    if ingested:
+        prefixes = set(get_dependent_collections(ContactFormSubmission))
+        if profiles_created:
+            prefixes.update(get_dependent_collections(ClientProfile))
+        # Existing clients' detail pages list their contact forms too
+        object_prefixes = {prefix for submission in ingested for prefix in get_dependent_objects(submission)}
+        invalidate_collections(sorted(prefixes), sorted(object_prefixes))
+    logger.info(f"Ingested {len(ingested)} contact form(s), created {profiles_created} client profile(s)")
+    return len(staged)
@@ -0,0 +1,52 @@
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from frostapi.caching import (
+    CACHE_DEPENDENCIES, clear_local_caches, get_dependent_collections, get_queryset_dependent_objects,
+    invalidate_collections,
+)
+
+
+class Command(BaseCommand):
+    help = "Invalidate cached API responses, for every collection or only those depending on the given models."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', default=[], dest='models',
+                            help="Model to scope to, e.g. EventData (repeatable).")
+        parser.add_argument('--flush', action='store_true',
+                            help="Flush the entire cache backend instead, including sessions and credentials.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['flush']:
+            if options['models']:
+                raise CommandError("--flush cannot be combined with --model.")
+            cache.clear()
+            clear_local_caches()
+            self.stdout.write(self.style.SUCCESS(f"Flushed the cache in {time.perf_counter() - started:.2f}s."))
+            return
+
+        if options['models']:
+            models = []
+            for name in options['models']:
+                try:
+                    models.append(apps.get_model('frostapi', name))
+                except LookupError:
+                    raise CommandError(f"Unknown model '{name}'.")
+        else:
+            models = [apps.get_model(label) for label in CACHE_DEPENDENCIES]
+
+        # Detail pages are versioned per object, so reach them through the rows they render
+        prefixes, object_prefixes = set(), set()
+        for model in models:
+            prefixes.update(get_dependent_collections(model))
+            object_prefixes.update(get_queryset_dependent_objects(model._default_manager.all()))
+
+        invalidate_collections(sorted(prefixes), sorted(object_prefixes))
+        self.stdout.write(self.style.SUCCESS(
+            f"Invalidated {len(prefixes)} collection(s) ({', '.join(sorted(prefixes)) or 'none'}) and "
+            f"{len(object_prefixes)} detail page version(s) in {time.perf_counter() - started:.2f}s."
+        ))
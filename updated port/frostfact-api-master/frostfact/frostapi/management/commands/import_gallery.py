@@ -0,0 +1,163 @@
+import hashlib
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from itertools import islice
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from frostapi.caching import invalidate_model_caches
+from frostapi.image_processing import get_derivative_formats, render_derivatives, store_derivative
+from frostapi.models import GalleryData, ImageStatusChoices, allocate_unique_slugs
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.tif', '.tiff', '.bmp')
+
+
+def read_sources(path):
+    """
+    Yield `(name, bytes)` for every image in a directory or zip archive, in name order. Zip members keep
+    their archive path, so `a/IMG_0001.jpg` and `b/IMG_0001.jpg` stay distinct.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('__MACOSX/'):
+                    yield name, archive.read(name)
+    elif os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                with open(os.path.join(path, name), 'rb') as source:
+                    yield name, source.read()
+    else:
+        raise CommandError(f"'{path}' is neither a directory nor a zip archive.")
+
+
+def render_source(name, source_bytes, widths, primary_height, formats):
+    """Process-pool task: decode, resize and encode one photo. Errors are returned, not raised."""
+    try:
+        _, primary_width, renditions = render_derivatives(source_bytes, widths, primary_height, formats)
+    except Exception as e:
+        return name, None, str(e)
+    return name, (primary_width, renditions), None
+
+
+class Command(BaseCommand):
+    help = "Bulk import gallery photos from a directory or zip: parallel processing, concurrent uploads, bulk_create."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Directory or .zip archive of images.")
+        parser.add_argument('--position', default=GalleryData.EventChoices.SLIDER_TOP,
+                            choices=GalleryData.EventChoices.values, help="gallery_position for the new rows.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Image processing processes.")
+        parser.add_argument('--upload-workers', type=int, default=16, help="Concurrent upload threads.")
+        parser.add_argument('--batch-size', type=int, default=100, help="Rows per bulk_create.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        template = GalleryData()
+        self.storage = GalleryData._meta.get_field(template.image_field_name).storage
+        self.render_args = (template.get_image_widths(), template.image_height, get_derivative_formats())
+        self.params_digest = template.get_image_params_digest()
+        totals = {'imported': 0, 'skipped': 0, 'bytes': 0, 'render': 0.0, 'upload': 0.0}
+        failed = []
+
+        # Work in batches so memory stays bounded by --batch-size photos, not the whole import
+        sources = read_sources(options['path'])
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool, \
+                ThreadPoolExecutor(max_workers=options['upload_workers']) as uploader:
+            while batch := list(islice(sources, options['batch_size'])):
+                self.import_batch(batch, pool, uploader, options['position'], totals, failed)
+
+        if totals['imported']:
+            # bulk_create skips post_save, so invalidate the gallery caches once here
+            invalidate_model_caches(GalleryData)
+
+        elapsed = time.perf_counter() - started
+        for name, error in failed:
+            self.stderr.write(f"Failed: {name}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {totals['imported']} photo(s), skipped {totals['skipped']} duplicate(s), {len(failed)} failed "
+            f"in {elapsed:.1f}s ({totals['imported'] / elapsed:.1f} photos/s, "
+            f"{totals['bytes'] / 1024 / 1024 / elapsed:.1f} MB/s source). "
+            f"Processing {totals['render']:.1f}s, uploads {totals['upload']:.1f}s, "
+            f"database {elapsed - totals['render'] - totals['upload']:.1f}s."
+        ))
+
+    def import_batch(self, batch, pool, uploader, position, totals, failed):
+        digests = {name: f'{hashlib.sha256(data).hexdigest()}:{self.params_digest}' for name, data in batch}
+        existing = set(GalleryData.objects.filter(image_digest__in=digests.values()).values_list('image_digest', flat=True))
+        batch = [(name, data) for name, data in batch if digests[name] not in existing]
+        totals['skipped'] += len(digests) - len(batch)
+        totals['bytes'] += sum(len(data) for _, data in batch)
+
+        phase = time.perf_counter()
+        futures = [pool.submit(render_source, name, data, *self.render_args) for name, data in batch]
+        processed = []
+        for (name, data), future in zip(batch, futures):
+            _, result, error = future.result()
+            if error:
+                failed.append((name, error))
+            else:
+                processed.append((name, data, result))
+        totals['render'] += time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        uploaded = []
+        for (name, *_), (result, error) in zip(processed, uploader.map(lambda item: self.upload(*item), processed)):
+            if error:
+                failed.append((name, error))
+            else:
+                uploaded.append(result)
+        totals['upload'] += time.perf_counter() - phase
+
+        title_length = GalleryData._meta.get_field('gallery_media_title').max_length
+        titles = [
+            os.path.splitext(os.path.basename(name))[0].replace('_', ' ').replace('-', ' ')[:title_length]
+            for name, *_ in uploaded
+        ]
+        # Cut to the slug column by the allocator
+        slugs = allocate_unique_slugs(GalleryData, titles)
+        rows = []
+        for (name, original, primary_key, derivatives), title, slug in zip(uploaded, titles, slugs):
+            rows.append(GalleryData(
+                gallery_media_title=title,
+                gallery_media_image=primary_key,
+                gallery_media_type=GalleryData.MediaChoices.IMAGE,
+                gallery_position=position,
+                slug=slug,
+                image_original=original,
+                image_digest=digests[name],
+                image_derivatives=derivatives,
+                image_status=ImageStatusChoices.READY,
+            ))
+        try:
+            with transaction.atomic():
+                GalleryData.objects.bulk_create(rows)
+        except DatabaseError as e:
+            # The files are already stored; the rows are retried by the next import of the same source
+            failed.extend((name, f"Database insert failed: {e}") for name, *_ in uploaded)
+            return
+        totals['imported'] += len(rows)
+
+    def upload(self, name, data, result):
+        """
+        Store the original and every rendition of one photo; runs in the upload thread pool.
+        Returns `(uploaded, error)` so one failed upload doesn't abort the rest of the import.
+        """
+        primary_width, renditions = result
+        filename = os.path.basename(name)
+        try:
+            original = self.storage.save(filename, File(BytesIO(data), name=filename))
+            primary_key, derivatives = None, []
+            for rendition, buffer in renditions:
+                key = store_derivative(self.storage, rendition, buffer)
+                derivatives.append({k: rendition[k] for k in ('format', 'width', 'height')} | {'key': key})
+                if rendition['width'] == primary_width and rendition['format'] == 'webp':
+                    primary_key = key
+        except Exception as e:
+            return None, str(e)
+        return (name, original, primary_key or derivatives[-1]['key'], derivatives), None
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from frostapi.ingestion import ingest_staged_submissions
+from frostapi.queues import add_worker_arguments, run_worker
+
+
+class Command(BaseCommand):
+    help = "Ingest staged contact form submissions (profile linking, slugs, bulk insert) in batches."
+
+    def add_arguments(self, parser):
+        add_worker_arguments(parser, batch=100, sleep=2.0)
+
+    def handle(self, *args, **options):
+        run_worker(ingest_staged_submissions, options,
+                   lambda handled: self.stdout.write(f"Ingested {handled} staged submission(s)."))
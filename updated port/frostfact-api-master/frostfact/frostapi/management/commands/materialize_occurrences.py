@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from frostapi.caching import invalidate_model_caches
+from frostapi.models import EventData, EventOccurrence
+from frostapi.recurrence import get_hot_window, materialize_occurrences, set_materialized_horizon
+
+
+class Command(BaseCommand):
+    help = "Roll the materialized event occurrence window forward (run daily, e.g. from Heroku Scheduler)."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        start, end = get_hot_window()
+        pruned, _ = EventOccurrence.objects.filter(occurrence_date__lt=start).delete()
+
+        added = removed = 0
+        events = EventData.objects.filter(Q(recurrence_rule__gt='', event_date__lte=end) | Q(event_date__range=(start, end)))
+        for event in events.iterator():
+            created, deleted = materialize_occurrences(event, (start, end))
+            added += created
+            removed += deleted
+
+        set_materialized_horizon(end)
+        invalidate_model_caches(EventOccurrence)
+        self.stdout.write(self.style.SUCCESS(
+            f"Materialized occurrences {start} to {end}: {added} added, {removed + pruned} removed "
+            f"in {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from frostapi.image_processing import run_image_jobs
+from frostapi.queues import add_worker_arguments, run_worker
+
+
+class Command(BaseCommand):
+    help = "Process queued image uploads (resize, encode and swap in the processed key)."
+
+    def add_arguments(self, parser):
+        add_worker_arguments(parser, batch=10, sleep=5.0)
+
+    def handle(self, *args, **options):
+        run_worker(run_image_jobs, options, lambda handled: self.stdout.write(f"Processed {handled} image job(s)."))
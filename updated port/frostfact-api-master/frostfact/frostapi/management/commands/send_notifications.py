@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from frostapi.notifications import NotificationDispatcher
+from frostapi.queues import add_worker_arguments, run_worker
+
+
+class Command(BaseCommand):
+    help = "Send queued email notifications (routed inbox mail, confirmations and digests) over a pooled connection."
+
+    def add_arguments(self, parser):
+        add_worker_arguments(parser, batch=50, sleep=5.0)
+
+    def handle(self, *args, **options):
+        dispatcher = NotificationDispatcher()
+
+        def run_batch(limit):
+            sent, failed = dispatcher.dispatch(limit=limit)
+            return f"Sent {sent} message(s), {failed} failed." if sent or failed else None
+
+        try:
+            # Idle: don't hold the SMTP connection open between bursts
+            run_worker(run_batch, options, self.stdout.write, on_idle=dispatcher.close)
+        finally:
+            dispatcher.close()
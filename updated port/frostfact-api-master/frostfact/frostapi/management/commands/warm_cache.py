@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from frostapi.models import EventData, GalleryData
+
+# (list url name, detail url name or None, rows whose slugs have detail pages to warm). Details are warmed
+# for the public collections only: contact forms and client profiles grow with every submission and their
+# private pages get no visitor traffic, so they stay list-only to keep the release phase short.
+WARM_COLLECTIONS = [
+    ('faq_list', None, None),
+    ('policy_list', None, None),
+    ('slider_top_list', None, None),
+    ('slider_bottom_list', None, None),
+    ('hero_image', None, None),
+    ('gallery_data_list', 'gallery_data_detail', GalleryData.objects.all()),
+    ('event_data_list', 'event_data_detail', EventData.objects.filter(archived=False)),
+    ('event_occurrence_list', None, None),
+    ('client_data_list', None, None),
+    ('cont_form_list', None, None),
+]
+
+
+def get_event_filter_variants(months=3, upcoming=10):
+    """The calendar's common requests: this month and the next ones, plus the upcoming strip."""
+    today = timezone.localdate()
+    variants = [{'upcoming': upcoming}]
+    for offset in range(months):
+        year, month = divmod(today.month - 1 + offset, 12)
+        variants.append({'month': date(today.year + year, month + 1, 1).strftime('%Y-%m')})
+    return variants
+
+
+class Command(BaseCommand):
+    help = "Render every list, detail and common filter variant into the response cache (e.g. in the release phase)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent requests; 1 renders inline.")
+        parser.add_argument('--no-details', action='store_true', help="Skip per-slug detail responses.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.factory = APIRequestFactory()
+        # Unsaved user: satisfies the views' authentication check without touching the database
+        self.user = User(username='warm_cache', is_active=True)
+
+        requests = self.get_warm_requests(include_details=not options['no_details'])
+        if options['workers'] > 1:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                results = list(pool.map(self.warm_threaded, requests))
+        else:
+            results = [self.warm(*request) for request in requests]
+
+        failed = [(path, code) for path, code, _ in results if code != 200]
+        for path, code in failed:
+            self.stderr.write(f"Failed to warm {path}: HTTP {code}")
+        slowest = sorted(results, key=lambda result: result[2], reverse=True)[:3]
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {len(results) - len(failed)}/{len(results)} response(s) in {time.perf_counter() - started:.2f}s; "
+            f"slowest: {', '.join(f'{path} {elapsed * 1000:.0f}ms' for path, _, elapsed in slowest)}."
+        ))
+
+    def get_warm_requests(self, include_details=True):
+        """`(path, params)` for every response to render."""
+        requests = []
+        for list_name, detail_name, rows in WARM_COLLECTIONS:
+            requests.append((reverse(list_name), {}))
+            if include_details and detail_name:
+                for slug in rows.exclude(slug=None).values_list('slug', flat=True).iterator():
+                    requests.append((reverse(detail_name, kwargs={'slug': slug}), {}))
+        requests.extend((reverse('event_data_list'), params) for params in get_event_filter_variants())
+        return requests
+
+    def warm(self, path, params):
+        """Render one request through its view, which stores the response under the same key a visitor would use."""
+        request = self.factory.get(path, params, HTTP_ACCEPT='application/json')
+        force_authenticate(request, user=self.user)
+        match = resolve(path)
+        started = time.perf_counter()
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+            code = response.status_code
+        except Exception as e:
+            self.stderr.write(f"Error warming {path}: {e}")
+            code = 500
+        return path + (f"?{request.META['QUERY_STRING']}" if params else ''), code, time.perf_counter() - started
+
+    def warm_threaded(self, request):
+        try:
+            return self.warm(*request)
+        finally:
+            # Each pool thread opened its own connection
+            connection.close()
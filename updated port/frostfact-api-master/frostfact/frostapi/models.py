@@ -1,121 +1,252 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 import uuid
+from functools import reduce
+from operator import or_
+import hashlib
 from rest_framework.authtoken.models import Token
 from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
-from PIL import Image
-from io import BytesIO
-from django.core.files.base import ContentFile
 from django.utils import timezone
 import logging
-from storages.backends.s3boto3 import S3Boto3Storage
-import boto3
+from .storage import CustomS3Boto3Storage, select_image_storage
+from .recurrence import get_exception_dates, materialize_occurrences, parse_rule
+from django.contrib.contenttypes.models import ContentType
 from datetime import timezone as dt_timezone
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
 
-class CustomS3Boto3Storage(S3Boto3Storage):
-    location = ''
-    file_overwrite = False
-    default_acl = 'public-read'
-
+def default_time():
+    return timezone.now().astimezone(dt_timezone.utc).time()
 
-def resize_and_save_image(instance, image_field, desired_height, bucket_name=str(settings.AWS_STORAGE_BUCKET_NAME),
-                          region_name='us-west-1'):
-    try:
-        if image_field:
-            print(f"Starting image processing for file: '{image_field.name}' in instance '{instance}'")
 
-            # Open the image using Pillow
-            img = Image.open(image_field)
-            print(f"Image opened: name='{image_field.name}', mode='{img.mode}', format='{img.format}', size={img.size}")
+def default_date():
+    return timezone.now().date()
 
-            # Calculate the corresponding width to maintain aspect ratio
-            aspect_ratio = img.width / img.height
-            new_width = int(desired_height * aspect_ratio)
-            print(f"Calculated aspect ratio: {aspect_ratio:.2f}, resizing to: {new_width}x{desired_height}")
 
-            # Resize the image
-            img = img.resize((new_width, desired_height), Image.Resampling.LANCZOS)
-            print(f"Image resized to: {new_width}x{desired_height}")
+SLUG_SAVE_ATTEMPTS = 5
+SLUG_SUFFIX_RESERVE = 6  # Room for "-99999" when a long base has to be shortened to fit a counter
 
-            # Save the image as WebP
-            img_io = BytesIO()
 
-            if img.mode != "RGBA" and img.mode != "RGB":
-                img = img.convert("RGBA")
-                print(f"Converted image to RGBA mode for WebP format")
+def get_slug_base(model_class, field_value):
+    """
+    Slugified `field_value` (the model name if that is empty) cut to the slug column's max_length, and the
+    prefix shared by every numbered variant of it, for the lookup of taken slugs.
+    """
+    max_length = model_class._meta.get_field('slug').max_length
+    base_slug = slugify(field_value)[:max_length].strip('-') or model_class._meta.model_name
+    return base_slug, base_slug[:max_length - SLUG_SUFFIX_RESERVE].rstrip('-')
 
-            img.save(img_io, format='WEBP', optimize=True, quality=85)  # Optimize and reduce quality if needed
-            print(f"Image saved to BytesIO as WebP with optimization")
 
-            # Generate a safe filename using the instance's slug with .webp extension
-            img_name = f"{slugify(instance.slug or 'image')}.webp"
-            img_content = ContentFile(img_io.getvalue(), img_name)
-            print(f"Generated image name for S3: '{img_name}'")
+def next_free_slug(base_slug, taken, max_length=None):
+    """First of `base`, `base-1`, `base-2`, ... that is not in `taken`, the base shortened so each fits `max_length`."""
+    if base_slug not in taken:
+        return base_slug
+    num = 1
+    while True:
+        suffix = f"-{num}"
+        stem = base_slug if max_length is None else base_slug[:max_length - len(suffix)].rstrip('-')
+        if f"{stem}{suffix}" not in taken:
+            return f"{stem}{suffix}"
+        num += 1
 
-            # Upload to S3
-            s3 = boto3.client('s3', region_name=region_name)
-            key = f"{img_name}"
-            print(f"Preparing to upload to S3 bucket '{bucket_name}' with key '{key}'")
 
-            response = s3.put_object(
-                Bucket=bucket_name,
-                Key=key,
-                Body=img_content,
-                ContentType='image/webp',  # WebP content type
-                ACL='public-read'
-            )
-            print(f"S3 Response: {response}")
+def generate_unique_slug(model_class, field_value):
+    """
+    Generates a unique slug for a given model and field value, no longer than the slug column.
 
-            print(f"Successfully uploaded image to S3: bucket='{bucket_name}', key='{key}', content_type='image/webp', ACL='public-read'")
+    All existing slugs sharing the base are fetched with one prefix query, however many duplicates exist.
+    """
+    base_slug, prefix = get_slug_base(model_class, field_value)
+    taken = set(model_class.objects.filter(slug__startswith=prefix).values_list('slug', flat=True))
+    return next_free_slug(base_slug, taken, model_class._meta.get_field('slug').max_length)
+
+
+def allocate_unique_slugs(model_class, field_values):
+    """Unique slugs for a batch of values (one query), also unique among themselves. Used for bulk_create."""
+    bases = [get_slug_base(model_class, value) for value in field_values]
+    if not bases:
+        return []
+    prefixes = reduce(or_, (Q(slug__startswith=prefix) for prefix in {prefix for _, prefix in bases}))
+    taken = set(model_class.objects.filter(prefixes).values_list('slug', flat=True))
+    max_length = model_class._meta.get_field('slug').max_length
+    slugs = []
+    for base, _ in bases:
+        slug = next_free_slug(base, taken, max_length)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+class UniqueSlugMixin(models.Model):
+    """
+    Fills `slug` from `get_slug_source()` on first save: by default the value of the `slug_source_field`
+    attribute, or the model name when that is unset or empty. Override the method to combine fields.
 
-            # Update the image field with the S3 key
-            print(f"Image processing complete for file '{image_field.name}', S3 key: '{key}'")
-            return key
+    Two concurrent saves can still pick the same free slug; the loser hits the unique constraint, so the
+    insert runs in a savepoint and is retried with a freshly allocated slug.
+    """
 
-    except Exception as e:
-        logger.error(f"Error processing image '{image_field.name}' for instance '{instance}': {e}")
-        print(f"Error processing image '{image_field.name}' for instance '{instance}': {e}")
-        raise e
+    slug_source_field = None
 
+    class Meta:
+        abstract = True
 
+    def get_slug_source(self):
+        if self.slug_source_field is None:
+            return ''
+        return getattr(self, self.slug_source_field) or ''
 
-def default_time():
-    return timezone.now().astimezone(dt_timezone.utc).time()
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        model_class = type(self)
+        self.slug = generate_unique_slug(model_class, self.get_slug_source())
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_SAVE_ATTEMPTS - 1 or not model_class.objects.filter(slug=self.slug).exists():
+                    raise
+                logger.warning(f"Slug '{self.slug}' was taken concurrently for {model_class.__name__}, retrying")
+                self.slug = generate_unique_slug(model_class, self.get_slug_source())
+
+
+class ImageStatusChoices(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    PROCESSING = 'processing', 'Processing'
+    READY = 'ready', 'Ready'
+    FAILED = 'failed', 'Failed'
+
+
+class ImageProcessingMixin(models.Model):
+    """
+    Stores uploads as-is and leaves resizing to the `process_images` worker.
 
+    Subclasses set `image_field_name` (the ImageField holding the served image), `image_height` (height of
+    the primary WebP kept in that field) and `image_widths` (responsive ladder, overridable per model via
+    settings.IMAGE_DERIVATIVE_WIDTHS). The worker swaps the primary key into the field when done and
+    records every rendition in `image_derivatives`.
+    """
+    image_field_name = None
+    image_height = 500
+    image_widths = (320, 640, 960)
+
+    image_status = models.CharField(max_length=20, choices=ImageStatusChoices, blank=True, null=True,
+                                    editable=False, verbose_name='Image Status')
+    image_original = models.CharField(max_length=255, blank=True, null=True, editable=False,
+                                      verbose_name='Original Image Key')
+    image_digest = models.CharField(max_length=100, blank=True, null=True, editable=False,
+                                    verbose_name='Image Digest')
+    image_derivatives = models.JSONField(default=list, blank=True, editable=False,
+                                         verbose_name='Image Derivatives')
 
-def default_date():
-    return timezone.now().date()
+    class Meta:
+        abstract = True
+
+    def get_image_widths(self):
+        return tuple(settings.IMAGE_DERIVATIVE_WIDTHS.get(type(self).__name__, self.image_widths))
+
+    def get_image_params_digest(self):
+        """Short digest of everything besides the source bytes that shapes the processed images."""
+        params = f'{self.image_height}:{self.get_image_widths()}:{tuple(settings.IMAGE_DERIVATIVE_FORMATS)}'
+        return hashlib.md5(params.encode('utf-8')).hexdigest()[:12]
+
+    def stage_image_upload(self):
+        """
+        Decide whether the image needs (re)processing and stage it. Returns True if a job should be queued.
+
+        `image_digest` is `<sha256 of source>:<params digest>`. An untouched field costs no image I/O, a
+        re-upload of identical bytes keeps the current processed image, and a params change re-queues
+        the stored original.
+        """
+        image = getattr(self, self.image_field_name)
+        if not image:
+            return False
+
+        params_digest = self.get_image_params_digest()
+        if image._committed:
+            if not self.image_original or not self.image_digest:
+                return False
+            source_digest, _, stored_params = self.image_digest.partition(':')
+            if stored_params == params_digest:
+                return False
+            self.image_digest = f'{source_digest}:{params_digest}'
+            self.image_status = ImageStatusChoices.PENDING
+            return True
+
+        sha = hashlib.sha256()
+        for chunk in image.chunks():
+            sha.update(chunk)
+        digest = f'{sha.hexdigest()}:{params_digest}'
+        if self.pk and digest == self.image_digest:
+            current = type(self).objects.filter(pk=self.pk).values_list(self.image_field_name, flat=True).first()
+            if current:
+                setattr(self, self.image_field_name, current)
+                return False
+
+        image.save(image.name, image.file, save=False)
+        self.image_original = image.name
+        self.image_digest = digest
+        self.image_status = ImageStatusChoices.PENDING
+        return True
+
+    def enqueue_image_job(self):
+        return ImageJob.objects.create(
+            content_type=ContentType.objects.get_for_model(self),
+            object_id=self.pk,
+            source_name=self.image_original,
+        )
+
+
+class ImageJob(models.Model):
+    """Durable queue entry asking the `process_images` worker to resize one stored original."""
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    source_name = models.CharField(max_length=255, verbose_name='Original Image Key')
+    status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        ordering = ['run_after']
+        indexes = [models.Index(fields=['status', 'run_after'])]
+        verbose_name = 'Image Job'
+        verbose_name_plural = 'Image Jobs'
 
-def generate_unique_slug(model_class, field_value):
-    """
-    Generates a unique slug for a given model and field value.
-    """
-    base_slug = slugify(field_value)
-    unique_slug = base_slug
-    num = 1
-    while model_class.objects.filter(slug=unique_slug).exists():
-        unique_slug = f"{base_slug}-{num}"
-        num += 1
-    return unique_slug
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id}: {self.source_name} ({self.status})"
 
 
-class HeroImage(models.Model):
-    hero_image = models.ImageField(upload_to='', storage=CustomS3Boto3Storage(), blank=True,null=True, verbose_name="Hero Image")
+class HeroImage(ImageProcessingMixin, UniqueSlugMixin, models.Model):
+    hero_image = models.ImageField(upload_to='', storage=select_image_storage, blank=True,null=True, verbose_name="Hero Image")
     hero_image_name = models.CharField(max_length=20, blank=True, null=True, verbose_name='Hero Image Name')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At", editable=False)
     hero_image_live = models.BooleanField(default=False, verbose_name='Image Live')
     slug = models.SlugField(unique=True, blank=True, null=True, verbose_name="Hero Slug", editable=False)
 
+    image_field_name = 'hero_image'
+    image_height = 1080
+    image_widths = (640, 1080, 1920)
+
     class Meta:
         verbose_name = "Hero Image"
         verbose_name_plural = "Hero Images"
@@ -123,25 +254,19 @@ class HeroImage(models.Model):
     def __str__(self):
         return self.hero_image_name or "Unnamed Image"
 
+    def get_slug_source(self):
+        return self.hero_image_name or "hero-image"  # Fallback slug
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            if self.hero_image_name:
-                self.slug = generate_unique_slug(HeroImage, self.hero_image_name)
-            else:
-                self.slug = generate_unique_slug(HeroImage, "hero-image")  # Fallback slug
-
-        if self.hero_image:
-            self.hero_image = resize_and_save_image(
-                instance=self,
-                image_field=self.hero_image,
-                desired_height=1080,
-                bucket_name=str(settings.AWS_STORAGE_BUCKET_NAME)
-            )
+        image_staged = self.stage_image_upload()
 
         super(HeroImage, self).save(*args, **kwargs)
 
+        if image_staged:
+            self.enqueue_image_job()
+
 
-class ClientProfile(models.Model):
+class ClientProfile(UniqueSlugMixin, models.Model):
     client_first_name = models.CharField(max_length=255, blank=True, null=True, verbose_name="Client's First Name")
     client_last_name = models.CharField(max_length=255, blank=True, null=True, verbose_name="Client's Last Name")
     client_business = models.CharField(max_length=255, verbose_name="Client's Business")
@@ -152,16 +277,47 @@ class ClientProfile(models.Model):
     client_special_needs = models.TextField(blank=True, null=True, verbose_name="Client's Special Needs")
     slug = models.SlugField(unique=True, blank=True, null=True, verbose_name="Client Slug", editable=False)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = generate_unique_slug(ClientProfile, f'{self.client_last_name}-{self.client_business}')
-        super(ClientProfile, self).save(*args, **kwargs)
+    def get_slug_source(self):
+        return f'{self.client_last_name}-{self.client_business}'
+
+    @classmethod
+    def upsert_by_email(cls, email, **defaults):
+        """
+        Primary key of the profile for `email`, created from `defaults` if there is none.
+
+        A known email costs one indexed SELECT and leaves the profile untouched. Only a new email allocates
+        a slug (one prefix SELECT) and inserts, with INSERT … ON CONFLICT (client_email) where the database
+        supports it so a concurrent submission from the same address can't race it; other backends fall
+        back to get_or_create. The insert runs in a savepoint so a concurrently taken slug can be retried.
+        """
+        pk = cls.objects.filter(client_email=email).values_list('pk', flat=True).first()
+        if pk is not None:
+            return pk
+        profile = cls(client_email=email, **defaults)
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            profile.slug = generate_unique_slug(cls, profile.get_slug_source())
+            try:
+                with transaction.atomic():
+                    if connection.features.supports_update_conflicts_with_target:
+                        # Re-assigning the conflicting email is a no-op that lets RETURNING yield the existing pk
+                        cls.objects.bulk_create([profile], update_conflicts=True, unique_fields=['client_email'],
+                                                update_fields=['client_email'])
+                        if profile.pk is not None:
+                            return profile.pk
+                    return cls.objects.get_or_create(
+                        client_email=email, defaults={**defaults, 'slug': profile.slug}
+                    )[0].pk
+            except IntegrityError:
+                # Only a concurrently taken slug can conflict here; the email conflict is handled above
+                if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Slug '{profile.slug}' was taken concurrently for ClientProfile, retrying")
 
     def __str__(self):
         return f"{self.client_first_name} {self.client_last_name} - {self.client_business}"
 
 
-class ContactFormSubmission(models.Model):
+class ContactFormSubmission(UniqueSlugMixin, models.Model):
     customer_email = models.EmailField(verbose_name="Customer's Email", default="Enter Email Address Here", blank=True)
     subject = models.CharField(max_length=255, blank=True, null=True, verbose_name="Subject")
     client_profile = models.ForeignKey(ClientProfile, on_delete=models.CASCADE, related_name='contact_forms',
@@ -177,46 +333,97 @@ class ContactFormSubmission(models.Model):
     message_read = models.BooleanField(default=False)
     csrf_token = models.CharField(max_length=100, null=True, blank=True, verbose_name="CSRF Token")
 
+    def get_slug_source(self):
+        return f'{self.last_name}-{self.first_name}'
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = generate_unique_slug(ContactFormSubmission, f'{self.last_name}-{self.first_name}')
+        """
+        New submissions are linked to the client profile for their email in the same transaction, then
+        inserted once with the foreign key already set. For a known email that is the profile lookup, the
+        submission's slug prefix SELECT and its INSERT; a new email adds the profile's slug SELECT and upsert.
+        """
+        if not (self._state.adding and self.client_profile_id is None and self.customer_email):
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self.client_profile_id = ClientProfile.upsert_by_email(
+                self.customer_email,
+                client_first_name=self.first_name,
+                client_last_name=self.last_name,
+                client_phone=self.phone,
+            )
+            return super().save(*args, **kwargs)
 
+    def __str__(self):
+        return f"Submission by {self.customer_email} on {self.time_stamp}"
 
-        is_new = self._state.adding
-        super(ContactFormSubmission, self).save(*args, **kwargs)
 
-        if is_new and not self.client_profile:
-            self.run_after_save()
+class EmailNotification(models.Model):
+    """Outgoing email queued for the `send_notifications` worker, so no request waits on SMTP."""
+    class KindChoices(models.TextChoices):
+        INBOX = 'inbox', 'Inbox'
+        CONFIRMATION = 'confirmation', 'Confirmation'
+
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        SENT = 'sent', 'Sent'
+        FAILED = 'failed', 'Failed'
+
+    kind = models.CharField(max_length=20, choices=KindChoices)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    reply_to = models.EmailField(blank=True, null=True)
+    submission = models.ForeignKey('ContactFormSubmission', on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='notifications')
+    status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        ordering = ['run_after']
+        indexes = [models.Index(fields=['status', 'run_after'])]
+        verbose_name = 'Email Notification'
+        verbose_name_plural = 'Email Notifications'
 
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.recipient}: {self.subject} ({self.status})"
 
 
-    def __str__(self):
-        return f"Submission by {self.customer_email} on {self.time_stamp}"
+class StagedContactSubmission(models.Model):
+    """
+    Validated contact form waiting for the `ingest_contact_forms` worker.
 
-    def run_after_save(self):
-        if not self.client_profile:
-            client_profile, created = ClientProfile.objects.get_or_create(
-                client_email=self.customer_email,
-                defaults={
-                    'client_first_name': self.first_name,
-                    'client_last_name': self.last_name,
-                    'client_phone': self.phone
-                }
-            )
-            if created:
-                self.client_profile = client_profile
-                # Save again if a new ClientProfile was created
-                self.save()
+    The web request writes only this row; profile linking, slugging and the real insert happen in batches.
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        FAILED = 'failed', 'Failed'
+
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    csrf_token = models.CharField(max_length=100, null=True, blank=True, verbose_name="CSRF Token")
+    status = models.CharField(max_length=20, choices=StatusChoices, default=StatusChoices.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        verbose_name = 'Staged Contact Submission'
+        verbose_name_plural = 'Staged Contact Submissions'
 
-@receiver(post_save, sender=ContactFormSubmission)
-def execute_after_save(sender, instance, created, **kwargs):
-    if created:
-        instance.run_after_save()
+    def __str__(self):
+        return f"Staged submission #{self.pk} ({self.status})"
 
 
-class EventData(models.Model):
+class EventData(ImageProcessingMixin, UniqueSlugMixin, models.Model):
     class EventTypeChoices(models.TextChoices):
         MUSIC = 'Music', 'Music'
         THEATRE = 'Theatre', 'Theatre'
@@ -249,12 +456,19 @@ class EventData(models.Model):
     event_genre = models.CharField(max_length=30, blank=True, null=True, verbose_name='Event Genre')
     event_time = models.TimeField(default=default_time, verbose_name="Event Time")
     recurring = models.BooleanField(default=False, verbose_name="Recurring Event?", null=True, blank=True)
+    archived = models.BooleanField(default=False, verbose_name="Archived", help_text="Hidden from the public event lists")
+    recurrence_rule = models.CharField(
+        max_length=255, blank=True, null=True, verbose_name="Recurrence Rule",
+        help_text="RRULE starting at the event date, e.g. FREQ=WEEKLY;BYDAY=FR or FREQ=MONTHLY;BYDAY=2SA;UNTIL=20261231"
+    )
+    recurrence_exceptions = models.JSONField(default=list, blank=True, verbose_name="Skipped Dates",
+                                             help_text='Dates without an occurrence, e.g. ["2025-12-26"]')
     event_host = models.CharField(max_length=255, blank=True, null=True, verbose_name="Event Host")
     client_profile = models.ForeignKey(ClientProfile, on_delete=models.CASCADE, related_name='events',
                                        verbose_name="Client Profile")
     event_image = models.ImageField(
         upload_to='',
-        storage=CustomS3Boto3Storage(),
+        storage=select_image_storage,
         blank=True,
         null=True,
         verbose_name='Image Upload'
@@ -269,36 +483,93 @@ class EventData(models.Model):
     artist_youtube = models.URLField(validators=[URLValidator()], blank=True, null=True, verbose_name='youtube')
     artist_facebook = models.URLField(validators=[URLValidator()], blank=True, null=True, verbose_name='Facebook')
 
-    def save(self, *args, **kwargs):
-        # Generate slug if it doesn't exist
-        if not self.slug:
-            self.slug = generate_unique_slug(EventData, self.event_name)
+    image_field_name = 'event_image'
+    image_height = 500
+    slug_source_field = 'event_name'
+    schedule_fields = {'event_date', 'event_time', 'recurrence_rule', 'recurrence_exceptions'}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields() & cls.schedule_fields:
+            # Partial loads (e.g. only() projections) skip this rather than fetching the deferred columns
+            instance._schedule_fingerprint = instance.get_schedule_fingerprint()
+        return instance
+
+    def get_schedule_fingerprint(self):
+        """Everything that decides where this event's occurrences fall (the `schedule_fields`)."""
+        return (self.event_date, self.event_time, self.recurrence_rule, tuple(self.recurrence_exceptions or ()))
+
+    def clean(self):
+        super().clean()
+        if self.recurrence_rule:
+            try:
+                parse_rule(self.recurrence_rule, self.event_date, self.event_time)
+            except (ValueError, TypeError) as e:
+                raise ValidationError({'recurrence_rule': f"Invalid recurrence rule: {e}"})
+        try:
+            get_exception_dates(self)
+        except (ValueError, TypeError):
+            raise ValidationError({'recurrence_exceptions': "Use a list of YYYY-MM-DD dates."})
 
+    def save(self, *args, **kwargs):
         # Set event_month based on event_date
         if self.event_date:
             month_number = self.event_date.month
             self.event_month = dict(self.MONTH_CHOICES).get(month_number)
 
-        if self.event_image:
-            self.event_image = resize_and_save_image(
-                instance=self,
-                image_field=self.event_image,
-                desired_height=500,
-                bucket_name=str(settings.AWS_STORAGE_BUCKET_NAME)
-            )
+        if self.recurrence_rule:
+            self.recurring = True
+
+        # Store the raw upload; resizing happens in the process_images worker
+        image_staged = self.stage_image_upload()
 
         # Save the instance
         super(EventData, self).save(*args, **kwargs)
 
+        if image_staged:
+            self.enqueue_image_job()
+
+        # Keep the materialized occurrences in step with the schedule, only when it changed
+        fingerprint = self.get_schedule_fingerprint()
+        if getattr(self, '_schedule_fingerprint', None) != fingerprint:
+            materialize_occurrences(self)
+            self._schedule_fingerprint = fingerprint
+
     def __str__(self):
         return self.event_name
 
     class Meta:
         ordering = ['event_date']
+        indexes = [
+            models.Index(fields=['event_date', 'event_type'], name='event_date_type_idx'),
+            # ?venue= filters with iexact, i.e. UPPER(event_venue::text) = UPPER(%s) on Postgres
+            models.Index(Upper('event_venue'), 'event_date', name='event_venue_upper_date_idx'),
+        ]
         verbose_name_plural = 'Event Entry'
         verbose_name = 'Events Entry'
 
 
+class EventOccurrence(models.Model):
+    """One dated occurrence of an event inside the hot window, maintained by `materialize_occurrences`."""
+    event = models.ForeignKey(EventData, on_delete=models.CASCADE, related_name='occurrences',
+                              verbose_name="Event")
+    occurrence_date = models.DateField(verbose_name="Occurrence Date")
+    occurrence_time = models.TimeField(verbose_name="Occurrence Time")
+
+    class Meta:
+        ordering = ['occurrence_date', 'occurrence_time']
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'occurrence_date'], name='unique_event_occurrence'),
+        ]
+        indexes = [models.Index(fields=['occurrence_date', 'occurrence_time'], name='occurrence_date_idx')]
+        verbose_name = 'Event Occurrence'
+        verbose_name_plural = 'Event Occurrences'
+
+    def __str__(self):
+        return f"{self.event} on {self.occurrence_date}"
+
+
 class FAQData(models.Model):
     faq_title = models.CharField(max_length=100, blank=True, null=True, verbose_name='FAQ Title')
     faq_descrip = models.TextField(blank=True, null=True, verbose_name='FAQ Description')
@@ -321,7 +592,7 @@ class PolicyData(models.Model):
         return self.policy_title
 
 
-class GalleryData(models.Model):
+class GalleryData(ImageProcessingMixin, UniqueSlugMixin, models.Model):
     class MediaChoices(models.TextChoices):
         IMAGE = 'image', 'image'
         VIDEO = 'video', 'video'
@@ -334,7 +605,7 @@ class GalleryData(models.Model):
     gallery_media_description = models.TextField(blank=True, null=True, verbose_name='Image/Video Description')
     gallery_media_image = models.ImageField(
         upload_to='',
-        storage=CustomS3Boto3Storage(),
+        storage=select_image_storage,
         blank=True,
         null=True,
         verbose_name='Image Upload'
@@ -347,6 +618,10 @@ class GalleryData(models.Model):
                                           verbose_name='Gallery Position', default=EventChoices.SLIDER_TOP)
     slug = models.SlugField(unique=True, blank=True, null=True, verbose_name="gallery Slug", editable=False)
 
+    image_field_name = 'gallery_media_image'
+    image_height = 500
+    slug_source_field = 'gallery_media_title'
+
     class Meta:
         verbose_name = 'Gallery image Entry'
         verbose_name_plural = 'Gallery images Entry'
@@ -355,20 +630,13 @@ class GalleryData(models.Model):
         return self.gallery_media_title
 
     def save(self, *args, **kwargs):
-
-        if not self.slug:
-            self.slug = generate_unique_slug(GalleryData, self.gallery_media_title)
-
-        if self.gallery_media_image:
-            self.gallery_media_image = resize_and_save_image(
-                instance=self,
-                image_field=self.gallery_media_image,
-                desired_height=500,
-                bucket_name=str(settings.AWS_STORAGE_BUCKET_NAME)
-            )
+        image_staged = self.stage_image_upload()
 
         super(GalleryData, self).save(*args, **kwargs)
 
+        if image_staged:
+            self.enqueue_image_job()
+
 
 class TextSliderTop(models.Model):
     top_slider_title = models.CharField(max_length=20, blank=True, null=True)
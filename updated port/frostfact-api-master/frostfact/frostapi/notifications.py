@@ -0,0 +1,169 @@
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmailNotification
+from .queues import claim_batch, schedule_retry
+
+logger = logging.getLogger(__name__)
+
+
+def route_subject(subject):
+    """Inbox for a contact form subject: the first CONTACT_ROUTING keyword it contains, else the default inbox."""
+    subject = (subject or '').lower()
+    for keyword, inbox in settings.CONTACT_ROUTING.items():
+        if keyword.lower() in subject:
+            return inbox
+    return settings.CONTACT_DEFAULT_INBOX
+
+
+def get_digest_run_after(now=None):
+    """End of the current digest interval, so every message for a digest inbox in that window is sent together."""
+    now = now or timezone.now()
+    interval = settings.CONTACT_DIGEST_INTERVAL
+    window_end = (int(now.timestamp()) // interval + 1) * interval
+    return datetime.fromtimestamp(window_end, tz=now.tzinfo)
+
+
+def build_submission_notifications(submission):
+    """The inbox notification and, when there is a customer address, the confirmation for one submission."""
+    inbox = route_subject(submission.subject)
+    name = ' '.join(filter(None, [submission.first_name, submission.last_name])) or submission.customer_email
+    notifications = [EmailNotification(
+        kind=EmailNotification.KindChoices.INBOX,
+        recipient=inbox,
+        subject=f"[Contact] {submission.subject or 'New message'} from {name}",
+        body=(
+            f"From: {name} <{submission.customer_email}>\n"
+            f"Phone: {submission.phone or '-'}\n"
+            f"Requested date: {submission.event_date_request}\n\n"
+            f"{submission.message}"
+        ),
+        reply_to=submission.customer_email or None,
+        submission=submission,
+        run_after=get_digest_run_after() if inbox in settings.CONTACT_DIGEST_INBOXES else timezone.now(),
+    )]
+    if submission.customer_email and '@' in submission.customer_email:
+        notifications.append(EmailNotification(
+            kind=EmailNotification.KindChoices.CONFIRMATION,
+            recipient=submission.customer_email,
+            subject="We received your message",
+            body=(
+                f"Hi {submission.first_name or 'there'},\n\n"
+                f"Thanks for contacting Frost Factory about \"{submission.subject or 'your event'}\". "
+                f"We'll get back to you soon.\n\nFrost Factory"
+            ),
+            reply_to=inbox,
+            submission=submission,
+        ))
+    return notifications
+
+
+def enqueue_submission_notifications(submissions):
+    """Queue the notifications for `submissions` with one insert."""
+    notifications = [n for submission in submissions for n in build_submission_notifications(submission)]
+    return EmailNotification.objects.bulk_create(notifications)
+
+
+def claim_notifications(limit=50):
+    """Claim up to `limit` due notifications, plus ones a crashed worker left processing past their lease."""
+    return claim_batch(
+        EmailNotification, limit, due=Q(run_after__lte=timezone.now()), order_by=('run_after',),
+        max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+    )
+
+
+def build_digest(recipient, notifications):
+    sections = [f"{n.subject}\n{'-' * len(n.subject)}\n{n.body}" for n in notifications]
+    return EmailMessage(
+        subject=f"[Contact] {len(notifications)} new messages",
+        body='\n\n\n'.join(sections),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+    )
+
+
+def build_message(notification):
+    return EmailMessage(
+        subject=notification.subject,
+        body=notification.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[notification.recipient],
+        reply_to=[notification.reply_to] if notification.reply_to else None,
+    )
+
+
+class NotificationDispatcher:
+    """
+    Sends queued notifications over one long-lived mail connection.
+
+    The connection is opened lazily, reused for every message across batches and reopened after a
+    failure. Inbox notifications for CONTACT_DIGEST_INBOXES are merged into one digest per batch.
+    """
+
+    def __init__(self, connection=None):
+        self._connection = connection
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = get_connection(fail_silently=False)
+            self._connection.open()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing mail connection: {e}")
+            self._connection = None
+
+    def group(self, notifications):
+        """`(message, notifications)` pairs: one digest per digest inbox, one message for everything else."""
+        digests = {}
+        groups = []
+        for notification in notifications:
+            if (notification.kind == EmailNotification.KindChoices.INBOX
+                    and notification.recipient in settings.CONTACT_DIGEST_INBOXES):
+                digests.setdefault(notification.recipient, []).append(notification)
+            else:
+                groups.append((build_message(notification), [notification]))
+        for recipient, members in digests.items():
+            message = build_message(members[0]) if len(members) == 1 else build_digest(recipient, members)
+            groups.append((message, members))
+        return groups
+
+    def send(self, message, notifications):
+        try:
+            self.connection.send_messages([message])
+        except Exception as e:
+            logger.error(f"Sending to {', '.join(message.to)} failed: {e}")
+            self.close()
+            self.mark_failed(notifications, e)
+            return False
+        EmailNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+            status=EmailNotification.StatusChoices.SENT, sent_at=timezone.now(), last_error=None
+        )
+        return True
+
+    @staticmethod
+    def mark_failed(notifications, error):
+        """Reschedule with exponential backoff, or give up after NOTIFICATION_MAX_ATTEMPTS."""
+        for notification in notifications:
+            schedule_retry(notification, error, settings.NOTIFICATION_MAX_ATTEMPTS, settings.NOTIFICATION_RETRY_BACKOFF)
+        EmailNotification.objects.bulk_update(notifications, ['status', 'run_after', 'last_error'])
+
+    def dispatch(self, limit=50):
+        """Claim and send one batch of due notifications. Returns `(sent, failed)` message counts."""
+        sent = failed = 0
+        for message, notifications in self.group(claim_notifications(limit)):
+            if self.send(message, notifications):
+                sent += 1
+            else:
+                failed += 1
+        return sent, failed
@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    """`?page=N&page_size=M` pagination, PAGE_SIZE rows per page by default."""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    `?cursor=` keyset pagination: each page is a range query on the ordering column, so deep pages cost
+    the same as the first. Views set the ordering through `cursor_ordering`.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-pk'
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = ordering
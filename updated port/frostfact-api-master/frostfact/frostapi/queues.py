@@ -0,0 +1,86 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+LEASE_SECONDS = getattr(settings, 'QUEUE_LEASE_SECONDS', 600)
+
+
+def claim_batch(model, limit, due=None, order_by=('pk',), select_related=(), max_attempts=None, on_abandon=None):
+    """
+    Lock up to `limit` rows of a queue model and mark them as processing so other workers skip them.
+
+    `model` has `status` (StatusChoices with PENDING, PROCESSING and FAILED), `attempts`, `last_error` and
+    `updated_at`. Claimable rows are pending ones matching `due`, plus processing ones whose lease
+    (QUEUE_LEASE_SECONDS since the claim) ran out because their worker died mid-batch; those are handed
+    out again, so delivery is at-least-once. Expired rows that already used `max_attempts` are marked
+    failed instead and passed to `on_abandon`.
+    """
+    status = model.StatusChoices
+    now = timezone.now()
+    pending = Q(status=status.PENDING) & (due or Q())
+    expired = Q(status=status.PROCESSING, updated_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+    with transaction.atomic():
+        rows = list(
+            model.objects.select_for_update(skip_locked=True, of=('self',)).select_related(*select_related)
+            .filter(pending | expired).order_by(*order_by)[:limit]
+        )
+        abandoned = [
+            row for row in rows
+            if row.status == status.PROCESSING and max_attempts and row.attempts >= max_attempts
+        ]
+        rows = [row for row in rows if row not in abandoned]
+        model.objects.filter(pk__in=[row.pk for row in abandoned]).update(
+            status=status.FAILED, last_error="Worker lease expired on the last attempt", updated_at=now
+        )
+        model.objects.filter(pk__in=[row.pk for row in rows]).update(
+            status=status.PROCESSING, attempts=F('attempts') + 1, updated_at=now
+        )
+    for row in rows:
+        row.status = status.PROCESSING
+        row.attempts += 1
+        row.updated_at = now
+    if abandoned and on_abandon:
+        on_abandon(abandoned)
+    return rows
+
+
+def schedule_retry(row, error, max_attempts, backoff=None):
+    """
+    Put a failed row back to pending, delayed by an exponential backoff when `backoff` seconds are given,
+    or fail it for good once it used `max_attempts`. Only sets the fields; returns whether it will retry.
+    """
+    row.last_error = str(error)
+    if row.attempts >= max_attempts:
+        row.status = row.StatusChoices.FAILED
+        return False
+    row.status = row.StatusChoices.PENDING
+    if backoff:
+        row.run_after = timezone.now() + timedelta(seconds=backoff * 2 ** (row.attempts - 1))
+    return True
+
+
+def add_worker_arguments(parser, batch, sleep):
+    parser.add_argument('--batch', type=int, default=batch, help="Rows claimed per batch.")
+    parser.add_argument('--sleep', type=float, default=sleep, help="Seconds to wait when the queue is empty.")
+    parser.add_argument('--once', action='store_true', help="Drain the due rows once and exit.")
+
+
+def run_worker(run_batch, options, report, on_idle=None):
+    """
+    Polling loop of the queue workers: call `run_batch(limit)` and `report` its result until it returns
+    a falsy one, then sleep (calling `on_idle` first) or, with --once, return.
+    """
+    while True:
+        result = run_batch(options['batch'])
+        if result:
+            report(result)
+        elif options['once']:
+            return
+        else:
+            if on_idle:
+                on_idle()
+            time.sleep(options['sleep'])
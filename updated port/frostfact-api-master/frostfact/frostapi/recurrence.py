@@ -0,0 +1,90 @@
+import logging
+from datetime import date, datetime, time, timedelta
+
+from dateutil.rrule import rrulestr
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HOT_WINDOW_DAYS = getattr(settings, 'EVENT_OCCURRENCE_HORIZON_DAYS', 90)
+HORIZON_CACHE_KEY = 'event_occurrences_horizon'
+
+
+def parse_rule(rule, event_date, event_time=None):
+    """Parse an RRULE string anchored at the event's first date (e.g. FREQ=WEEKLY;BYDAY=FR, FREQ=MONTHLY;BYDAY=2SA)."""
+    dtstart = datetime.combine(event_date, event_time or time.min)
+    return rrulestr(rule, dtstart=dtstart, ignoretz=True)
+
+
+def get_exception_dates(event):
+    return {date.fromisoformat(value) for value in event.recurrence_exceptions or []}
+
+
+def iter_occurrences(event, start, end):
+    """Lazily yield the dates `event` happens on within [start, end], honouring exception dates."""
+    if not event.recurrence_rule:
+        if start <= event.event_date <= end:
+            yield event.event_date
+        return
+
+    exceptions = get_exception_dates(event)
+    rule = parse_rule(event.recurrence_rule, event.event_date, event.event_time)
+    for occurrence in rule.xafter(datetime.combine(max(start, event.event_date), time.min), inc=True):
+        occurrence_date = occurrence.date()
+        if occurrence_date > end:
+            return
+        if occurrence_date not in exceptions:
+            yield occurrence_date
+
+
+def expand_occurrences(events, start, end):
+    """`(event, date)` pairs for every event in the window, in calendar order; used outside the hot window."""
+    pairs = [(event, day) for event in events for day in iter_occurrences(event, start, end)]
+    return sorted(pairs, key=lambda pair: (pair[1], pair[0].event_time, pair[0].pk))
+
+
+def get_hot_window(today=None):
+    today = today or timezone.localdate()
+    return today, today + timedelta(days=HOT_WINDOW_DAYS)
+
+
+def materialize_occurrences(event, window=None):
+    """
+    Bring `event`'s rows in the occurrence table in line with its rule for the hot window.
+
+    Only the difference is written: stale dates are deleted, missing ones inserted and the time is
+    updated in place, so a rule edit touches just the occurrences it actually changed.
+    """
+    start, end = window or get_hot_window()
+    occurrence_model = event.occurrences.model
+    desired = set(iter_occurrences(event, start, end))
+    existing = dict(
+        event.occurrences.filter(occurrence_date__range=(start, end)).values_list('occurrence_date', 'occurrence_time')
+    )
+
+    with transaction.atomic():
+        stale = set(existing) - desired
+        if stale:
+            event.occurrences.filter(occurrence_date__in=stale).delete()
+        missing = desired - set(existing)
+        if missing:
+            occurrence_model.objects.bulk_create([
+                occurrence_model(event=event, occurrence_date=day, occurrence_time=event.event_time)
+                for day in sorted(missing)
+            ])
+        if any(existing[day] != event.event_time for day in desired & set(existing)):
+            event.occurrences.filter(occurrence_date__range=(start, end)).update(occurrence_time=event.event_time)
+    return len(missing), len(stale)
+
+
+def get_materialized_horizon():
+    """Last date the occurrence table is known to be complete up to, as recorded by `materialize_occurrences`."""
+    horizon = cache.get(HORIZON_CACHE_KEY)
+    return date.fromisoformat(horizon) if horizon else None
+
+
+def set_materialized_horizon(end):
+    cache.set(HORIZON_CACHE_KEY, end.isoformat(), timeout=None)
@@ -1,23 +1,68 @@
 from rest_framework import serializers
 from .models import *
 
+# Processing bookkeeping of ImageProcessingMixin; clients get the renditions through `srcset`
+IMAGE_INTERNAL_FIELDS = ('image_original', 'image_digest', 'image_status', 'image_derivatives')
+
+
+class SrcsetMixin(serializers.Serializer):
+    """Adds `srcset`: one srcset string per derivative format, e.g. {"webp": "<url> 320w, <url> 640w"}."""
+    srcset = serializers.SerializerMethodField()
+
+    def get_srcset(self, obj):
+        storage = obj._meta.get_field(obj.image_field_name).storage
+        entries = {}
+        for rendition in sorted(obj.image_derivatives or [], key=lambda r: r['width']):
+            entries.setdefault(rendition['format'], []).append(f"{storage.url(rendition['key'])} {rendition['width']}w")
+        return {fmt: ', '.join(items) for fmt, items in entries.items()}
+
 class ContactFormSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ContactFormSubmission
         fields = '__all__'
 
-class EventDataSerializer(serializers.ModelSerializer):
+class EventDataSerializer(SrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = EventData
-        fields = '__all__'
+        exclude = IMAGE_INTERNAL_FIELDS
+
+
+class ClientContactFormSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ContactFormSubmission
+        fields = ['id', 'slug', 'subject', 'first_name', 'last_name', 'customer_email', 'event_date_request',
+                  'time_stamp', 'message_read']
+
+
+class ClientEventSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventData
+        fields = ['id', 'slug', 'event_name', 'event_date', 'event_time', 'event_type', 'event_venue']
+
+
 class ClientProfileSerializer(serializers.ModelSerializer):
-    contact_submissions = ContactFormSerializer(many=True, read_only=True)
-    events = EventDataSerializer(many=True, read_only=True)
+    """
+    Client profile with compact summaries of its contact forms and events.
+
+    Pass `expand` (an iterable of names from `expandable_fields`) in the context to limit which nested
+    collections are rendered; without it both are included.
+    """
+    expandable_fields = ('contact_forms', 'events')
+    contact_forms = ClientContactFormSummarySerializer(many=True, read_only=True)
+    events = ClientEventSummarySerializer(many=True, read_only=True)
+
     class Meta:
         model = ClientProfile
         fields = '__all__'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = self.context.get('expand')
+        if expand is not None:
+            for name in set(self.expandable_fields) - set(expand):
+                self.fields.pop(name)
+
 class FaqDataSerializer(serializers.ModelSerializer):
     class Meta:
         model = FAQData
@@ -40,12 +85,25 @@ class TextSliderBottomSerializer(serializers.ModelSerializer):
         model = TextSliderBottom
         fields = '__all__'
 
-class GalleryDataSerializer(serializers.ModelSerializer):
+class GalleryDataSerializer(SrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = GalleryData
-        fields = '__all__'
+        exclude = IMAGE_INTERNAL_FIELDS
 
-class HeroImageDataSerializer(serializers.ModelSerializer):
+class HeroImageDataSerializer(SrcsetMixin, serializers.ModelSerializer):
     class Meta:
         model = HeroImage
-        fields = '__all__'
\ No newline at end of file
+        exclude = IMAGE_INTERNAL_FIELDS
+
+
+class EventOccurrenceSerializer(serializers.ModelSerializer):
+    event_slug = serializers.CharField(source='event.slug', read_only=True)
+    event_name = serializers.CharField(source='event.event_name', read_only=True)
+    event_type = serializers.CharField(source='event.event_type', read_only=True)
+    event_venue = serializers.CharField(source='event.event_venue', read_only=True)
+    event_genre = serializers.CharField(source='event.event_genre', read_only=True)
+
+    class Meta:
+        model = EventOccurrence
+        fields = ['occurrence_date', 'occurrence_time', 'event_slug', 'event_name', 'event_type', 'event_venue',
+                  'event_genre']
@@ -1,104 +1,52 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.core.cache import cache
 import logging
 from .models import *
+from django.apps import apps
+from django.db import transaction
+from .notifications import enqueue_submission_notifications
+from .caching import CACHE_DEPENDENCIES, invalidate_instance_caches
+from .authentication import credential_cache
+from django.contrib.auth.models import User
 
 # Create a logger
 logger = logging.getLogger(__name__)
 
-def get_cache_key(model_name):
-    """Generates a cache key for each model."""
-    return f'{model_name}_queryset'
-
-def get_instance_cache_key(instance):
-    """Generates a cache key for a specific instance."""
-    return f'{instance.__class__.__name__.lower()}_{instance.pk}_data'
-
-def log_cache_status(action, model_name, cache_key, instance):
-    """Log cache status with detailed information."""
-    logger.info(f'{action} - Model: {model_name}, Cache Key: {cache_key}, Instance: {instance.pk}')
-    if cache.get(cache_key) is not None:
-        logger.info(f'Cache content: {cache.get(cache_key)}')
-    else:
-        logger.info('Cache is empty')
-
-# Error handling wrapper for cache invalidation
-def safe_invalidate_cache(cache_key, instance, model_name):
+# Error handling wrapper for cache invalidation; inside a request or transaction the invalidation is queued
+# and flushed once at its end, so a burst of saves costs a single round of cache writes
+def safe_invalidate_cache(instance, model_name, deleted=False):
     try:
-        cache.delete(cache_key)
-        log_cache_status('Cache deleted', model_name, cache_key, instance)
+        invalidate_instance_caches(instance, deleted=deleted)
     except Exception as e:
         logger.error(f"Error invalidating cache for {model_name}, Instance: {instance.pk}. Error: {str(e)}")
+    else:
+        logger.debug(f'Cache invalidation queued - Model: {model_name}, Instance: {instance.pk}')
 
 
-# ContactFormSubmission Cache Invalidation
-@receiver(post_save, sender=ContactFormSubmission)
-@receiver(post_delete, sender=ContactFormSubmission)
-def invalidate_contact_form_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('contact_form_submission')
-    safe_invalidate_cache(cache_key, instance, 'ContactFormSubmission')
-
-
-# EventData Cache Invalidation
-@receiver(post_save, sender=EventData)
-@receiver(post_delete, sender=EventData)
-def invalidate_event_data_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('event_data')
-    safe_invalidate_cache(cache_key, instance, 'EventData')
-
-
-# ClientProfile Cache Invalidation
-@receiver(post_save, sender=ClientProfile)
-@receiver(post_delete, sender=ClientProfile)
-def invalidate_client_profile_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('client_profile')
-    safe_invalidate_cache(cache_key, instance, 'ClientProfile')
-
-
-# FAQData Cache Invalidation
-@receiver(post_save, sender=FAQData)
-@receiver(post_delete, sender=FAQData)
-def invalidate_faq_data_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('faq_data')
-    safe_invalidate_cache(cache_key, instance, 'FAQData')
-
-
-# PolicyData Cache Invalidation
-@receiver(post_save, sender=PolicyData)
-@receiver(post_delete, sender=PolicyData)
-def invalidate_policy_data_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('policy_data')
-    safe_invalidate_cache(cache_key, instance, 'PolicyData')
+# Model cache invalidation: the collections in CACHE_DEPENDENCIES and detail pages in OBJECT_DEPENDENCIES
+def invalidate_dependent_caches(sender, instance, **kwargs):
+    safe_invalidate_cache(instance, sender.__name__)
 
 
-# TextSliderTop Cache Invalidation
-@receiver(post_save, sender=TextSliderTop)
-@receiver(post_delete, sender=TextSliderTop)
-def invalidate_text_slider_top_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('text_slider_top')
-    safe_invalidate_cache(cache_key, instance, 'TextSliderTop')
+def invalidate_deleted_caches(sender, instance, **kwargs):
+    safe_invalidate_cache(instance, sender.__name__, deleted=True)
 
 
-# TextSliderBottom Cache Invalidation
-@receiver(post_save, sender=TextSliderBottom)
-@receiver(post_delete, sender=TextSliderBottom)
-def invalidate_text_slider_bottom_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('text_slider_bottom')
-    safe_invalidate_cache(cache_key, instance, 'TextSliderBottom')
+for label in CACHE_DEPENDENCIES:
+    model = apps.get_model(label)
+    post_save.connect(invalidate_dependent_caches, sender=model, dispatch_uid=f'invalidate_{label}_save')
+    post_delete.connect(invalidate_deleted_caches, sender=model, dispatch_uid=f'invalidate_{label}_delete')
 
 
-# HeroImage Cache Invalidation
-@receiver(post_save, sender=HeroImage)
-@receiver(post_delete, sender=HeroImage)
-def invalidate_hero_image_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('hero_image')
-    safe_invalidate_cache(cache_key, instance, 'HeroImage')
+# Queue the routed inbox mail and customer confirmation once the submission is committed
+@receiver(post_save, sender=ContactFormSubmission)
+def queue_contact_notifications(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: enqueue_submission_notifications([instance]))
 
 
-# GalleryData Cache Invalidation
-@receiver(post_save, sender=GalleryData)
-@receiver(post_delete, sender=GalleryData)
-def invalidate_gallery_data_cache(sender, instance, **kwargs):
-    cache_key = get_cache_key('gallery_data')
-    safe_invalidate_cache(cache_key, instance, 'GalleryData')
+# Drop cached credentials as soon as a user's password or active flag may have changed
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_credentials(sender, instance, **kwargs):
+    credential_cache.invalidate_user(instance.pk)
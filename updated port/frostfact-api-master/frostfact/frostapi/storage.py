@@ -0,0 +1,89 @@
+import logging
+import threading
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from django.conf import settings
+from django.core.files import File
+from django.utils.module_loading import import_string
+from storages.backends.s3boto3 import S3Boto3Storage
+
+logger = logging.getLogger(__name__)
+
+
+class CustomS3Boto3Storage(S3Boto3Storage):
+    location = ''
+    file_overwrite = False
+    default_acl = 'public-read'
+
+
+class StorageClientManager:
+    """
+    Process-wide S3 client and transfer settings.
+
+    boto3 clients are thread-safe, so one client (and its connection pool) is shared by every thread and
+    every upload instead of paying session creation, credential resolution and TLS setup per image.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = boto3.session.Session().client(
+                        's3',
+                        region_name=settings.AWS_S3_REGION_NAME,
+                        config=Config(
+                            max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+                            retries={'max_attempts': 5, 'mode': 'adaptive'},
+                        ),
+                    )
+        return self._client
+
+    def get_transfer_config(self):
+        return TransferConfig(
+            multipart_threshold=settings.AWS_S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.AWS_S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=4,
+            use_threads=True,
+        )
+
+    def reset(self):
+        with self._lock:
+            self._client = None
+
+
+storage_clients = StorageClientManager()
+_image_storage = None
+
+
+def select_image_storage():
+    """Shared storage for uploaded images: S3 by default, any Django storage via IMAGE_STORAGE_BACKEND."""
+    global _image_storage
+    if _image_storage is None:
+        _image_storage = import_string(settings.IMAGE_STORAGE_BACKEND)()
+    return _image_storage
+
+
+def upload_buffer(storage, key, buffer, content_type):
+    """
+    Upload an in-memory buffer to `key` without copying it.
+
+    S3 uploads stream from the buffer through the shared client, switching to multipart above
+    AWS_S3_MULTIPART_THRESHOLD. Any other storage (e.g. FileSystemStorage locally) gets the same buffer
+    wrapped in a File. Returns the stored name.
+    """
+    buffer.seek(0)
+    if isinstance(storage, S3Boto3Storage):
+        extra_args = {'ContentType': content_type}
+        if storage.default_acl:
+            extra_args['ACL'] = storage.default_acl
+        storage_clients.get_client().upload_fileobj(
+            buffer, storage.bucket_name, key, ExtraArgs=extra_args, Config=storage_clients.get_transfer_config()
+        )
+        return key
+    return storage.save(key, File(buffer, name=key))
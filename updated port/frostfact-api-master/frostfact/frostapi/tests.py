@@ -1,8 +1,26 @@
-from django.test import TestCase, Client
+import os
+import shutil
+import tempfile
+from base64 import b64encode
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from PIL import Image
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
-from .models import ContactFormSubmission, HeroImage, EventData, ClientProfile, PolicyData, FAQData, GalleryData, TextSliderTop, TextSliderBottom
+from .authentication import credential_cache
+from .caching import clear_local_caches
+from .image_processing import run_image_jobs
+from .serializers import GalleryDataSerializer
+from .storage import CustomS3Boto3Storage, storage_clients, upload_buffer
+from .models import allocate_unique_slugs, generate_unique_slug, EventOccurrence, ImageJob, ImageStatusChoices, StagedContactSubmission, EmailNotification, ContactFormSubmission, HeroImage, EventData, ClientProfile, PolicyData, FAQData, GalleryData, TextSliderTop, TextSliderBottom
 
 class APITestCase(TestCase):
 
@@ -88,3 +106,1065 @@ class APITestCase(TestCase):
         response = self.client.get(reverse('text_slider_bottom_api'), **self.authenticate())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('true', str(response.content).lower())
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedAPITestCase(TestCase):
+    """Empty local-memory and per-process caches for every test, plus an API user and its Basic auth header."""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_caches()
+        credential_cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+
+    def authenticate(self, password='testpass'):
+        credentials = b64encode(f'testuser:{password}'.encode('utf-8')).decode('utf-8')
+        return {'HTTP_AUTHORIZATION': f'Basic {credentials}'}
+
+
+class ResponseCacheTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.faq = FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+
+    def test_list_is_served_from_cached_bytes(self):
+        first = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', first)
+        self.assertEqual(first['Content-Length'], str(len(first.content)))
+
+        with self.assertNumQueries(1):  # cached credential re-check only, no FAQ query
+            second = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_save_invalidates_cached_response(self):
+        self.client.get(reverse('faq_list'), **self.authenticate())
+        self.faq.faq_title = "Parking lot"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.save()
+        response = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertIn('Parking lot', response.content.decode())
+
+    def test_hot_collection_is_served_from_worker_memory(self):
+        first = self.client.get(reverse('faq_list'), **self.authenticate())
+        with mock.patch.object(cache, 'get', side_effect=AssertionError("shared cache read")):
+            second = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(second.content, first.content)
+
+        self.faq.faq_title = "Parking lot"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.save()
+        self.assertIn('Parking lot', self.client.get(reverse('faq_list'), **self.authenticate()).content.decode())
+
+    def test_conditional_get_returns_not_modified_until_collection_changes(self):
+        first = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertIn('Last-Modified', first)
+
+        response = self.client.get(reverse('faq_list'), HTTP_IF_NONE_MATCH=first['ETag'], **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQData.objects.create(faq_title="Bags", faq_descrip="Small bags only")
+        response = self.client.get(reverse('faq_list'), HTTP_IF_NONE_MATCH=first['ETag'], **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+
+class CredentialCacheTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+
+    def test_password_is_hashed_once_per_credential(self):
+        with mock.patch.object(User, 'check_password', autospec=True, return_value=True) as check_password:
+            self.client.get(reverse('faq_list'), **self.authenticate())
+            self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(check_password.call_count, 1)
+        self.assertEqual(credential_cache.stats()['hits'], 1)
+
+    def test_password_change_invalidates_cached_credential(self):
+        self.client.get(reverse('faq_list'), **self.authenticate())
+        self.user.set_password('newpass')
+        self.user.save()
+        response = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse('faq_list'), **self.authenticate())
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.get(reverse('faq_list'), **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenAuthenticationTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+
+    def obtain_token(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpass'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_bearer_token_skips_database(self):
+        headers = {'HTTP_AUTHORIZATION': f"Bearer {self.obtain_token()['access']}"}
+        self.assertEqual(self.client.get(reverse('faq_list'), **headers).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('faq_list'), **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_refresh_issues_new_access_token(self):
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.obtain_token()['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.json())
+
+    def test_tampered_token_is_rejected(self):
+        headers = {'HTTP_AUTHORIZATION': f"Bearer {self.obtain_token()['access']}x"}
+        response = self.client.get(reverse('faq_list'), **headers)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+def make_upload(name='photo.png', size=(1600, 1000), color='red'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ImageJobTestCase(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        field = GalleryData._meta.get_field('gallery_media_image')
+        patcher = mock.patch.object(field, 'storage', FileSystemStorage(location=self.media_root))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_upload_is_queued_and_processed_by_worker(self):
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        self.assertEqual(gallery.image_status, ImageStatusChoices.PENDING)
+        self.assertEqual(gallery.gallery_media_image.name, gallery.image_original)
+        self.assertEqual(ImageJob.objects.filter(object_id=gallery.pk).count(), 1)
+
+        self.assertEqual(run_image_jobs(), 1)
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.image_status, ImageStatusChoices.READY)
+        self.assertTrue(gallery.gallery_media_image.name.endswith('.webp'))
+        with gallery.gallery_media_image.open('rb') as processed:
+            self.assertEqual(Image.open(processed).size, (800, 500))
+
+    def test_failed_job_is_retried_later(self):
+        broken = SimpleUploadedFile('broken.png', b'not an image', content_type='image/png')
+        gallery = GalleryData.objects.create(gallery_media_title="Broken", gallery_media_image=broken)
+
+        run_image_jobs()
+        job = ImageJob.objects.get(object_id=gallery.pk)
+        self.assertEqual(job.status, ImageJob.StatusChoices.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.last_error)
+        self.assertEqual(run_image_jobs(), 0)  # backing off
+
+    def test_job_left_processing_by_a_dead_worker_is_reclaimed(self):
+        from .image_processing import claim_image_jobs
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        self.assertEqual(len(claim_image_jobs()), 1)  # the worker dies here
+        self.assertEqual(run_image_jobs(), 0)  # still leased
+
+        ImageJob.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_image_jobs(), 1)
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.image_status, ImageStatusChoices.READY)
+        self.assertEqual(ImageJob.objects.get().attempts, 2)
+
+    def test_expired_job_on_its_last_attempt_fails(self):
+        from .image_processing import claim_image_jobs
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        claim_image_jobs()
+        ImageJob.objects.update(attempts=5, updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_image_jobs(), 0)
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.StatusChoices.FAILED)
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.image_status, ImageStatusChoices.FAILED)
+
+    def test_unchanged_image_is_not_reprocessed(self):
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        run_image_jobs()
+        gallery.refresh_from_db()
+        processed_name = gallery.gallery_media_image.name
+
+        gallery.gallery_media_description = "Updated caption"
+        with mock.patch.object(FileSystemStorage, 'open') as storage_open:
+            gallery.save()
+        storage_open.assert_not_called()
+
+        gallery.gallery_media_image = make_upload()
+        gallery.save()
+        gallery.refresh_from_db()
+        self.assertEqual(gallery.gallery_media_image.name, processed_name)
+        self.assertEqual(ImageJob.objects.filter(object_id=gallery.pk).count(), 1)
+
+    def test_changed_processing_params_requeue_original(self):
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        run_image_jobs()
+        gallery.refresh_from_db()
+
+        with mock.patch.object(GalleryData, 'image_height', 250):
+            gallery.save()
+            self.assertEqual(ImageJob.objects.filter(object_id=gallery.pk).count(), 2)
+            run_image_jobs()
+        gallery.refresh_from_db()
+        with gallery.gallery_media_image.open('rb') as processed:
+            self.assertEqual(Image.open(processed).size, (400, 250))
+
+    def test_worker_records_responsive_renditions(self):
+        gallery = GalleryData.objects.create(gallery_media_title="Opening night", gallery_media_image=make_upload())
+        run_image_jobs()
+        gallery.refresh_from_db()
+
+        widths = sorted({r['width'] for r in gallery.image_derivatives})
+        self.assertEqual(widths, [320, 640, 800, 960])
+        self.assertIn(gallery.gallery_media_image.name, [r['key'] for r in gallery.image_derivatives])
+        self.assertTrue(all(r['key'].startswith('derivatives/') for r in gallery.image_derivatives))
+
+        data = GalleryDataSerializer(gallery).data
+        self.assertFalse({'image_original', 'image_digest', 'image_status', 'image_derivatives'} & set(data))
+        srcset = data['srcset']
+        self.assertIn('webp', srcset)
+        self.assertIn('jpeg', srcset)
+        self.assertTrue(srcset['webp'].endswith('960w'))
+
+
+    def test_import_gallery_bulk_creates_processed_rows(self):
+        source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source_dir, ignore_errors=True)
+        for name, color in (('stage_left.png', 'red'), ('stage-right.png', 'blue'), ('notes.txt', None)):
+            with open(os.path.join(source_dir, name), 'wb') as target:
+                target.write(make_upload(name, color=color).read() if color else b'not a photo')
+
+        output = StringIO()
+        call_command('import_gallery', source_dir, workers=2, stdout=output)
+        self.assertIn('Imported 2 photo(s)', output.getvalue())
+        rows = GalleryData.objects.order_by('slug')
+        self.assertEqual([row.slug for row in rows], ['stage-left', 'stage-right'])
+        self.assertTrue(all(row.image_status == ImageStatusChoices.READY and row.image_derivatives for row in rows))
+        self.assertFalse(ImageJob.objects.exists())
+
+        call_command('import_gallery', source_dir, workers=2, stdout=output)
+        self.assertIn('skipped 2 duplicate(s)', output.getvalue())
+        self.assertEqual(GalleryData.objects.count(), 2)
+
+    def test_import_gallery_keeps_same_named_zip_members_apart(self):
+        import zipfile
+        source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source_dir, ignore_errors=True)
+        archive_path = os.path.join(source_dir, 'photos.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr('a/IMG_0001.png', make_upload(color='red').read())
+            archive.writestr('b/IMG_0001.png', make_upload(color='blue').read())
+
+        call_command('import_gallery', archive_path, workers=2, stdout=StringIO())
+        self.assertEqual(GalleryData.objects.values('image_digest').distinct().count(), 2)
+        output = StringIO()
+        call_command('import_gallery', archive_path, workers=2, stdout=output)
+        self.assertIn('skipped 2 duplicate(s)', output.getvalue())
+
+    def test_import_gallery_reports_failed_uploads(self):
+        source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source_dir, ignore_errors=True)
+        with open(os.path.join(source_dir, 'stage.png'), 'wb') as target:
+            target.write(make_upload().read())
+
+        output, errors = StringIO(), StringIO()
+        with mock.patch('frostapi.management.commands.import_gallery.store_derivative',
+                        side_effect=OSError("bucket unreachable")):
+            call_command('import_gallery', source_dir, workers=2, stdout=output, stderr=errors)
+        self.assertIn('Imported 0 photo(s)', output.getvalue())
+        self.assertIn('1 failed', output.getvalue())
+        self.assertIn('stage.png: bucket unreachable', errors.getvalue())
+        self.assertFalse(GalleryData.objects.exists())
+
+    def test_import_gallery_reports_failed_inserts(self):
+        from django.db import DataError
+        source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source_dir, ignore_errors=True)
+        with open(os.path.join(source_dir, 'stage.png'), 'wb') as target:
+            target.write(make_upload().read())
+
+        output, errors = StringIO(), StringIO()
+        with mock.patch.object(GalleryData.objects, 'bulk_create', side_effect=DataError("value too long")):
+            call_command('import_gallery', source_dir, workers=2, stdout=output, stderr=errors)
+        self.assertIn('Imported 0 photo(s)', output.getvalue())
+        self.assertIn('1 failed', output.getvalue())
+        self.assertIn('stage.png: Database insert failed: value too long', errors.getvalue())
+
+
+class StorageUploadTestCase(SimpleTestCase):
+
+    def test_s3_client_is_created_once_per_process(self):
+        storage_clients.reset()
+        self.addCleanup(storage_clients.reset)
+        with mock.patch('frostapi.storage.boto3.session.Session') as session:
+            self.assertIs(storage_clients.get_client(), storage_clients.get_client())
+        session.assert_called_once()
+
+    def test_s3_upload_streams_the_buffer_through_the_shared_client(self):
+        storage = CustomS3Boto3Storage(bucket_name='media')
+        buffer = BytesIO(b'encoded image')
+        client = mock.Mock()
+        with mock.patch.object(storage_clients, 'get_client', return_value=client):
+            key = upload_buffer(storage, 'derivatives/ab/abc.webp', buffer, 'image/webp')
+
+        self.assertEqual(key, 'derivatives/ab/abc.webp')
+        args, kwargs = client.upload_fileobj.call_args
+        self.assertIs(args[0], buffer)
+        self.assertEqual(args[1:], ('media', 'derivatives/ab/abc.webp'))
+        self.assertEqual(kwargs['ExtraArgs'], {'ContentType': 'image/webp', 'ACL': 'public-read'})
+
+    def test_other_storages_receive_the_same_buffer(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        storage = FileSystemStorage(location=media_root)
+        key = upload_buffer(storage, 'derivatives/ab/abc.webp', BytesIO(b'encoded image'), 'image/webp')
+        with storage.open(key, 'rb') as stored:
+            self.assertEqual(stored.read(), b'encoded image')
+
+
+class SlugAllocationTestCase(TestCase):
+
+    def setUp(self):
+        for _ in range(4):
+            GalleryData.objects.create(gallery_media_title="Live Music Night")
+
+    def test_collisions_resolved_with_one_query(self):
+        with self.assertNumQueries(1):
+            slug = generate_unique_slug(GalleryData, "Live Music Night")
+        self.assertEqual(slug, 'live-music-night-4')
+
+    def test_batch_allocation_is_unique_within_batch(self):
+        with self.assertNumQueries(1):
+            slugs = allocate_unique_slugs(GalleryData, ["Live Music Night", "Live Music Night", "Encore"])
+        self.assertEqual(slugs, ['live-music-night-4', 'live-music-night-5', 'encore'])
+
+    def test_concurrent_slug_collision_is_retried(self):
+        stale = mock.Mock(side_effect=['live-music-night', 'live-music-night-4'])
+        with mock.patch('frostapi.models.generate_unique_slug', stale):
+            gallery = GalleryData.objects.create(gallery_media_title="Live Music Night")
+        self.assertEqual(gallery.slug, 'live-music-night-4')
+
+    def test_slug_source_field_falls_back_to_model_name(self):
+        untitled = GalleryData.objects.create(gallery_media_title="")
+        self.assertEqual(untitled.slug, 'gallerydata')
+
+    def test_long_slugs_fit_the_column_with_their_counter(self):
+        title = "An Evening of Extremely Long Gallery Titles at the Harbour"
+        first = GalleryData.objects.create(gallery_media_title=title)
+        second = GalleryData.objects.create(gallery_media_title=title)
+        third_slug = allocate_unique_slugs(GalleryData, [title])[0]
+        self.assertEqual(first.slug, 'an-evening-of-extremely-long-gallery-titles-at-the')
+        self.assertEqual(second.slug, 'an-evening-of-extremely-long-gallery-titles-at-t-1')
+        self.assertEqual(third_slug, 'an-evening-of-extremely-long-gallery-titles-at-t-2')
+
+
+class PaginationTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(25):
+            ContactFormSubmission.objects.create(customer_email="fan@example.com", first_name=f"Fan{i}", last_name="Doe")
+
+    def test_contact_list_is_paginated_by_default(self):
+        data = self.client.get(reverse('cont_form_list'), **self.authenticate()).json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 10)
+        self.assertIn('page=2', data['next'])
+
+        last = self.client.get(reverse('cont_form_list'), {'page': 3}, **self.authenticate()).json()
+        self.assertEqual(len(last['results']), 5)
+
+    def test_cursor_mode_walks_every_row_once(self):
+        seen = []
+        response = self.client.get(reverse('cont_form_list'), {'cursor': '', 'page_size': 10}, **self.authenticate())
+        while True:
+            data = response.json()
+            self.assertNotIn('count', data)
+            seen.extend(row['slug'] for row in data['results'])
+            if not data['next']:
+                break
+            response = self.client.get(data['next'], **self.authenticate())
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_content_collections_stay_unpaginated(self):
+        FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+        data = self.client.get(reverse('faq_list'), **self.authenticate()).json()
+        self.assertIsInstance(data, list)
+
+
+class EventCalendarTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        profile = ClientProfile.objects.create(client_business="Frost", client_email="venue@example.com")
+        today = timezone.localdate()
+        for name, event_date, event_type in (
+                ("March Music", date(2025, 3, 7), 'Music'),
+                ("March Market", date(2025, 3, 15), 'Market'),
+                ("April Music", date(2025, 4, 4), 'Music'),
+                ("Tonight", today, 'Music'),
+                ("Next Week", today + timedelta(days=7), 'Theatre'),
+                ("Next Month", today + timedelta(days=30), 'Music')):
+            EventData.objects.create(event_name=name, event_date=event_date, event_type=event_type,
+                                     event_venue="Main Room", client_profile=profile)
+
+    def names(self, **params):
+        response = self.client.get(reverse('event_data_list'), params, **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [event['event_name'] for event in response.json()]
+
+    def test_month_window_and_type(self):
+        self.assertEqual(self.names(month='2025-03'), ["March Music", "March Market"])
+        self.assertEqual(self.names(month='2025-03', type='Music'), ["March Music"])
+        self.assertEqual(self.names(start='2025-03-10', end='2025-04-30', venue='main room'),
+                         ["March Market", "April Music"])
+
+    def test_upcoming_returns_next_events_in_order(self):
+        self.assertEqual(self.names(upcoming=2), ["Tonight", "Next Week"])
+
+    def test_equivalent_windows_share_a_cache_entry(self):
+        self.names(month='2025-03')
+        with self.assertNumQueries(1):  # credential re-check only
+            self.assertEqual(self.names(start='2025-03-01', end='2025-03-31'), ["March Music", "March Market"])
+
+    def test_invalid_filter_is_a_bad_request(self):
+        response = self.client.get(reverse('event_data_list'), {'month': '2025-13'}, **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upcoming_cannot_be_paginated(self):
+        for paging in ({'cursor': ''}, {'page': 1}):
+            response = self.client.get(reverse('event_data_list'), {'upcoming': 3, **paging}, **self.authenticate())
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EventOccurrenceTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        first_friday = self.today + timedelta(days=(4 - self.today.weekday()) % 7)
+        self.fridays = [first_friday + timedelta(weeks=n) for n in range(4)]
+        profile = ClientProfile.objects.create(client_business="Frost", client_email="venue@example.com")
+        self.event = EventData.objects.create(event_name="Friday Jazz", event_date=first_friday, client_profile=profile,
+                                              recurrence_rule="FREQ=WEEKLY;BYDAY=FR",
+                                              recurrence_exceptions=[self.fridays[1].isoformat()])
+
+    def occurrence_dates(self):
+        return list(self.event.occurrences.order_by('occurrence_date')
+                    .filter(occurrence_date__lte=self.fridays[-1]).values_list('occurrence_date', flat=True))
+
+    def test_weekly_rule_materializes_hot_window_without_exceptions(self):
+        self.assertTrue(self.event.recurring)
+        self.assertEqual(self.occurrence_dates(), [self.fridays[0], self.fridays[2], self.fridays[3]])
+
+    def test_rule_edit_only_rewrites_changed_dates(self):
+        untouched = self.event.occurrences.get(occurrence_date=self.fridays[0]).pk
+        self.event.recurrence_exceptions = [self.fridays[2].isoformat()]
+        self.event.save()
+        self.assertEqual(self.occurrence_dates(), [self.fridays[0], self.fridays[1], self.fridays[3]])
+        self.assertEqual(self.event.occurrences.get(occurrence_date=self.fridays[0]).pk, untouched)
+
+    def test_api_matches_table_and_lazy_expansion(self):
+        auth = self.authenticate()
+        params = {'start': self.today.isoformat(), 'end': self.fridays[-1].isoformat()}
+
+        lazy = self.client.get(reverse('event_occurrence_list'), params, **auth).json()
+        call_command('materialize_occurrences', stdout=StringIO())
+        with mock.patch('frostapi.views.expand_occurrences') as expand:
+            materialized = self.client.get(reverse('event_occurrence_list'), params, **auth).json()
+        expand.assert_not_called()
+
+        self.assertEqual(lazy, materialized)
+        self.assertEqual([o['occurrence_date'] for o in lazy],
+                         [self.fridays[0].isoformat(), self.fridays[2].isoformat(), self.fridays[3].isoformat()])
+
+    def test_oversized_window_is_a_bad_request(self):
+        response = self.client.get(reverse('event_occurrence_list'), {'start': '2025-01-01', 'end': '2027-01-01'},
+                                   **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ClientDataTestCase(CachedAPITestCase):
+
+    def create_clients(self, count, offset=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(offset, offset + count):
+                profile = ClientProfile.objects.create(client_last_name=f"Last{n:02d}", client_business="Frost",
+                                                       client_email=f"client{n}@example.com")
+                ContactFormSubmission.objects.create(client_profile=profile, first_name="Ada",
+                                                     last_name=f"Last{n:02d}")
+                EventData.objects.create(event_name=f"Show {n}", event_date=date(2025, 5, 1), client_profile=profile)
+
+    def get(self, **params):
+        return self.client.get(reverse('client_data_list'), params, **self.authenticate())
+
+    def test_query_count_does_not_grow_with_clients(self):
+        self.create_clients(2)
+        # credentials, count, page, contact_forms prefetch, events prefetch
+        with self.assertNumQueries(5):
+            self.get(page_size=50)
+        self.create_clients(8, offset=2)
+        with self.assertNumQueries(5):
+            response = self.get(page_size=50)
+        results = response.json()['results']
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0]['client_last_name'], "Last00")
+        self.assertEqual(results[0]['contact_forms'][0]['last_name'], "Last00")
+        self.assertEqual(results[0]['events'][0]['event_name'], "Show 0")
+
+    def test_expand_limits_nested_collections(self):
+        self.create_clients(1)
+        with self.assertNumQueries(4):
+            result = self.get(expand='events').json()['results'][0]
+        self.assertIn('events', result)
+        self.assertNotIn('contact_forms', result)
+        result = self.get(expand='').json()['results'][0]
+        self.assertNotIn('events', result)
+        self.assertEqual(self.get(expand='orders').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_is_whitelisted(self):
+        self.create_clients(3)
+        names = [c['client_last_name'] for c in self.get(ordering='-client_last_name').json()['results']]
+        self.assertEqual(names, ["Last02", "Last01", "Last00"])
+        self.assertEqual(self.get(ordering='client_special_needs').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CacheDependencyTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ClientProfile.objects.create(client_last_name="Frost", client_business="Frost",
+                                                    client_email="venue@example.com")
+
+    def test_event_save_invalidates_event_and_client_collections(self):
+        event = EventData.objects.create(event_name="Opening", event_date=date(2025, 5, 1), client_profile=self.profile)
+        clients = self.client.get(reverse('client_data_list'), **self.authenticate())
+        window = self.client.get(reverse('event_data_list'), {'month': '2025-05'}, **self.authenticate())
+
+        event.event_name = "Grand Opening"
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+
+        response = self.client.get(reverse('client_data_list'), HTTP_IF_NONE_MATCH=clients['ETag'],
+                                   **self.authenticate())
+        self.assertEqual(response.json()['results'][0]['events'][0]['event_name'], "Grand Opening")
+        response = self.client.get(reverse('event_data_list'), {'month': '2025-05'},
+                                   HTTP_IF_NONE_MATCH=window['ETag'], **self.authenticate())
+        self.assertEqual(response.json()[0]['event_name'], "Grand Opening")
+
+    def test_contact_form_save_clears_instance_list(self):
+        cache.set('contact_form_queryset', ['stale'])
+        cache.set('client_data_queryset', ['stale'])
+        # The save runs in a transaction, so the invalidation waits for the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            ContactFormSubmission.objects.create(client_profile=self.profile, first_name="Ada", last_name="Lovelace")
+            self.assertEqual(cache.get('contact_form_queryset'), ['stale'])
+        self.assertIsNone(cache.get('contact_form_queryset'))
+        self.assertIsNone(cache.get('client_data_queryset'))
+
+    def test_transaction_invalidates_once_on_commit(self):
+        from django.db import transaction
+        from .caching import invalidate_collections
+        with mock.patch('frostapi.caching.invalidate_collections', wraps=invalidate_collections) as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    event = EventData.objects.create(event_name="Opening", client_profile=self.profile)
+                    event.event_name = "Grand Opening"
+                    event.save()
+                    ContactFormSubmission.objects.create(client_profile=self.profile, first_name="Ada")
+                    self.assertEqual(invalidate.call_count, 0)
+        self.assertEqual(invalidate.call_count, 1)
+        prefixes, object_prefixes, _ = invalidate.call_args.args
+        self.assertEqual(prefixes, ['client_data', 'contact_form', 'event_data', 'event_occurrences'])
+        self.assertIn(f'event_data_object_{event.pk}', object_prefixes)
+
+    def test_rolled_back_transaction_does_not_invalidate(self):
+        from django.db import transaction
+        with mock.patch('frostapi.caching.invalidate_collections') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        EventData.objects.create(event_name="Cancelled", client_profile=self.profile)
+                        raise ValueError
+                except ValueError:
+                    pass
+        invalidate.assert_not_called()
+
+    def test_rolled_back_keys_ride_along_with_the_next_flush(self):
+        from django.db import transaction
+        with mock.patch('frostapi.caching.invalidate_collections') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        EventData.objects.create(event_name="Cancelled", client_profile=self.profile)
+                        raise ValueError
+                except ValueError:
+                    pass
+                FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+        invalidate.assert_called_once()
+        self.assertIn('event_data', invalidate.call_args.args[0])
+        self.assertIn('faq_data', invalidate.call_args.args[0])
+
+
+class StampedeProtectionTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profile = ClientProfile.objects.create(client_last_name="Frost", client_business="Frost",
+                                                    client_email="venue@example.com")
+
+    def get_clients(self):
+        return self.client.get(reverse('client_data_list'), **self.authenticate())
+
+    def test_invalidated_list_serves_stale_while_another_worker_recomputes(self):
+        first = self.get_clients()
+        self.profile.client_last_name = "Frostbite"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.save()
+
+        # Another worker holds the recompute lock for every key
+        with mock.patch('frostapi.caching.acquire_lock', return_value=False), self.assertNumQueries(1):
+            stale = self.get_clients()
+        self.assertEqual(stale.content, first.content)
+
+        fresh = self.get_clients()
+        self.assertEqual(fresh.json()['results'][0]['client_last_name'], "Frostbite")
+
+    def test_response_is_never_rendered_from_a_stale_list(self):
+        event = EventData.objects.create(event_name="Opening", client_profile=self.profile)
+        self.client.get(reverse('event_data_list'), **self.authenticate())
+        event.event_name = "Encore"
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+
+        # Another worker is rebuilding the instance list, but nobody holds the response lock
+        held = lambda key, **kwargs: key != 'event_data_queryset_lock'
+        with mock.patch('frostapi.caching.acquire_lock', side_effect=held), \
+                mock.patch('frostapi.caching.CACHE_LOCK_WAIT', 0):
+            response = self.client.get(reverse('event_data_list'), **self.authenticate())
+        self.assertEqual(response.json()[0]['event_name'], "Encore")
+        response = self.client.get(reverse('event_data_list'), **self.authenticate())
+        self.assertEqual(response.json()[0]['event_name'], "Encore")
+
+    def test_unreachable_cache_is_a_plain_miss(self):
+        from .caching import get_or_compute
+        # django-redis with IGNORE_EXCEPTIONS answers None instead of raising while Redis is down
+        with mock.patch('frostapi.caching.cache') as down, mock.patch('frostapi.caching.time.sleep') as sleep:
+            down.add.return_value = None
+            down.get.return_value = None
+            self.assertEqual(get_or_compute('faq_data_queryset', lambda: ['fresh']), ['fresh'])
+        sleep.assert_not_called()
+
+    def test_early_expiry_probability_follows_remaining_ttl(self):
+        from .caching import should_refresh_early
+        now = timezone.now().timestamp()
+        self.assertTrue(should_refresh_early({'delta': 0.5, 'expires_at': now - 1}))
+        self.assertFalse(should_refresh_early({'delta': 0.001, 'expires_at': now + 3600}))
+
+
+class CacheCommandTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        FAQData.objects.create(faq_title="Parking", faq_descrip="Street only")
+        profile = ClientProfile.objects.create(client_business="Frost", client_email="venue@example.com")
+        EventData.objects.create(event_name="Opening", event_date=timezone.localdate(), client_profile=profile)
+
+    def get(self, name, **params):
+        return self.client.get(reverse(name), params, **self.authenticate())
+
+    def test_warm_cache_renders_lists_and_filter_variants(self):
+        out = StringIO()
+        call_command('warm_cache', workers=1, no_details=True, stdout=out, stderr=StringIO())
+        self.assertIn('Warmed', out.getvalue())
+        with self.assertNumQueries(3):  # one credential check per request, nothing rendered
+            self.get('faq_list')
+            self.get('event_data_list', month=timezone.localdate().strftime('%Y-%m'))
+            self.get('client_data_list')
+
+    def test_warm_cache_skips_private_detail_pages(self):
+        from django.core.management import load_command_class
+        command = load_command_class('frostapi', 'warm_cache')
+        submission = ContactFormSubmission.objects.create(customer_email="venue@example.com", first_name="Ada")
+        paths = [path for path, _ in command.get_warm_requests()]
+        self.assertIn(reverse('event_data_detail', kwargs={'slug': EventData.objects.get().slug}), paths)
+        self.assertIn(reverse('client_data_list'), paths)
+        self.assertNotIn(reverse('cont_form_data', kwargs={'slug': submission.slug}), paths)
+        self.assertNotIn(reverse('client_data_detail', kwargs={'slug': submission.client_profile.slug}), paths)
+
+    def test_clear_cache_can_be_scoped_to_a_model(self):
+        from .caching import get_collection_version
+        faq_version = get_collection_version('faq_data')
+        event_version = get_collection_version('event_data')
+        client_version = get_collection_version('client_data')
+        out = StringIO()
+        call_command('clear_cache', models=['EventData'], stdout=out)
+        self.assertIn('client_data', out.getvalue())
+        self.assertEqual(get_collection_version('faq_data'), faq_version)
+        self.assertNotEqual(get_collection_version('event_data'), event_version)
+        self.assertNotEqual(get_collection_version('client_data'), client_version)
+
+    def test_clear_cache_refreshes_detail_pages(self):
+        event = EventData.objects.get()
+        detail = reverse('event_data_detail', kwargs={'slug': event.slug})
+        self.assertEqual(self.client.get(detail, **self.authenticate()).json()['event_name'], "Opening")
+        EventData.objects.update(event_name="Renamed")  # sends no signals
+        call_command('clear_cache', models=['EventData'], stdout=StringIO())
+        self.assertEqual(self.client.get(detail, **self.authenticate()).json()['event_name'], "Renamed")
+
+
+class EmptyCollectionTestCase(CachedAPITestCase):
+
+    def get(self, name):
+        return self.client.get(reverse(name), **self.authenticate())
+
+    def test_empty_collection_is_a_cached_empty_list(self):
+        response = self.get('slider_bottom_list')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [])
+        with self.assertNumQueries(1):  # credential check only
+            self.assertEqual(self.get('slider_bottom_list').json(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TextSliderBottom.objects.create(bottom_slider_title="Winter", bottom_slider_text="Winter season",
+                                            active_text=True)
+        self.assertEqual(len(self.get('slider_bottom_list').json()), 1)
+
+    def test_empty_results_use_the_shorter_timeout(self):
+        from .caching import EMPTY_CACHE_TTL, RESPONSE_CACHE_TTL
+        from .views import CacheMixin
+        with mock.patch('frostapi.caching.set_cached_payload') as store:
+            self.assertEqual(CacheMixin.get_or_set_cache('hero_image_queryset', list), [])
+        self.assertEqual(store.call_args_list[0].kwargs['timeout'], EMPTY_CACHE_TTL)
+        self.assertNotEqual(EMPTY_CACHE_TTL, RESPONSE_CACHE_TTL)
+
+
+class DetailCacheTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile = ClientProfile.objects.create(client_last_name="Frost", client_business="Frost",
+                                                        client_email="venue@example.com")
+            self.events = [EventData.objects.create(event_name=f"Show {n}", event_date=date(2025, 5, n + 1),
+                                                    client_profile=self.profile) for n in range(3)]
+
+    def get(self, name, slug, **extra):
+        return self.client.get(reverse(name, kwargs={'slug': slug}), **self.authenticate(), **extra)
+
+    def test_detail_is_one_indexed_lookup_then_cached(self):
+        event = self.events[1]
+        # credentials, slug → pk, object by pk
+        with self.assertNumQueries(3):
+            response = self.get('event_data_detail', event.slug)
+        self.assertEqual(response.json()['event_name'], "Show 1")
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get('event_data_detail', event.slug).content, response.content)
+
+    def test_only_the_edited_object_and_its_client_go_stale(self):
+        first, second = self.events[0], self.events[1]
+        untouched = self.get('event_data_detail', first.slug)
+        client_page = self.get('client_data_detail', self.profile.slug)
+
+        second.event_name = "Encore"
+        with self.captureOnCommitCallbacks(execute=True):
+            second.save()
+
+        response = self.get('event_data_detail', first.slug, HTTP_IF_NONE_MATCH=untouched['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.get('client_data_detail', self.profile.slug, HTTP_IF_NONE_MATCH=client_page['ETag'])
+        self.assertIn("Encore", [event['event_name'] for event in response.json()['events']])
+
+    def test_deleted_object_is_not_found(self):
+        event = self.events[2]
+        self.get('event_data_detail', event.slug)
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertEqual(self.get('event_data_detail', event.slug).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get('event_data_detail', 'no-such-event').status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CONTACT_FORM_ASYNC_INGEST=True)
+class ContactIngestionTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.known = ClientProfile.objects.create(client_business="Frost", client_email="known@example.com")
+
+    def submit(self, email, last_name):
+        return self.client.post(reverse('cont_form_list'), {
+            'customer_email': email, 'first_name': "Ada", 'last_name': last_name,
+            'event_date_request': '2025-06-01', 'message': "Birthday party",
+        }, **self.authenticate())
+
+    def test_post_stages_with_one_write_and_returns_accepted(self):
+        self.submit('warmup@example.com', "Warmup")  # credential cache
+        with self.assertNumQueries(2):  # credential re-check, staging insert
+            response = self.submit('new@example.com', "Lovelace")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(StagedContactSubmission.objects.count(), 2)
+        self.assertFalse(ContactFormSubmission.objects.exists())
+
+    def test_worker_links_profiles_and_bulk_inserts(self):
+        self.submit('new@example.com', "Lovelace")
+        self.submit('new@example.com', "Lovelace")
+        self.submit('known@example.com', "Hopper")
+        self.assertEqual(self.submit('not-an-email', "Bad").status_code, status.HTTP_400_BAD_REQUEST)
+
+        call_command('ingest_contact_forms', once=True, stdout=StringIO())
+
+        self.assertFalse(StagedContactSubmission.objects.exists())
+        submissions = ContactFormSubmission.objects.order_by('pk')
+        self.assertEqual([s.slug for s in submissions], ['lovelace-ada', 'lovelace-ada-1', 'hopper-ada'])
+        self.assertEqual(submissions[0].client_profile, submissions[1].client_profile)
+        self.assertEqual(submissions[0].client_profile.client_email, 'new@example.com')
+        self.assertEqual(submissions[2].client_profile, self.known)
+        self.assertEqual(submissions[0].event_date_request, date(2025, 6, 1))
+
+    def test_posted_csrf_token_stays_out_of_the_payload(self):
+        response = self.client.post(reverse('cont_form_list'), {
+            'customer_email': 'new@example.com', 'last_name': "Lovelace", 'csrf_token': "from-the-form",
+        }, **self.authenticate())
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        staged = StagedContactSubmission.objects.get()
+        self.assertNotIn('csrf_token', staged.payload)
+
+        call_command('ingest_contact_forms', once=True, stdout=StringIO())
+        self.assertEqual(ContactFormSubmission.objects.get().csrf_token, staged.csrf_token)
+        self.assertFalse(StagedContactSubmission.objects.exists())
+
+    def test_ingest_refreshes_the_known_client_detail_page(self):
+        detail = reverse('client_data_detail', kwargs={'slug': self.known.slug})
+        self.assertEqual(self.client.get(detail, **self.authenticate()).json()['contact_forms'], [])
+        self.submit('known@example.com', "Hopper")
+        call_command('ingest_contact_forms', once=True, stdout=StringIO())
+        contact_forms = self.client.get(detail, **self.authenticate()).json()['contact_forms']
+        self.assertEqual([form['slug'] for form in contact_forms], ['hopper-ada'])
+
+    def test_failed_batch_is_retried_then_marked_failed(self):
+        from .ingestion import ingest_staged_submissions
+        self.submit('new@example.com', "Lovelace")
+        with mock.patch('frostapi.ingestion.link_client_profiles', side_effect=RuntimeError("db down")), \
+                mock.patch('frostapi.ingestion.MAX_ATTEMPTS', 2):
+            ingest_staged_submissions()
+            self.assertEqual(StagedContactSubmission.objects.get().status, StagedContactSubmission.StatusChoices.PENDING)
+            ingest_staged_submissions()
+        staged = StagedContactSubmission.objects.get()
+        self.assertEqual(staged.status, StagedContactSubmission.StatusChoices.FAILED)
+        self.assertEqual(staged.last_error, "db down")
+
+    def test_bad_row_does_not_fail_the_rest_of_its_batch(self):
+        from .ingestion import ingest_staged_submissions
+        self.submit('new@example.com', "Lovelace")
+        self.submit('other@example.com', "Hopper")
+        StagedContactSubmission.objects.filter(payload__last_name="Hopper").update(
+            payload={'customer_email': 'other@example.com', 'last_name': "Hopper", 'event_date_request': 'soon'}
+        )
+        ingest_staged_submissions()
+        self.assertEqual(list(ContactFormSubmission.objects.values_list('last_name', flat=True)), ["Lovelace"])
+        staged = StagedContactSubmission.objects.get()
+        self.assertEqual(staged.status, StagedContactSubmission.StatusChoices.PENDING)
+        self.assertEqual(staged.attempts, 1)
+
+    def test_rows_left_processing_by_a_dead_worker_are_reclaimed(self):
+        from .ingestion import claim_staged_submissions, ingest_staged_submissions
+        self.submit('new@example.com', "Lovelace")
+        claim_staged_submissions()  # the worker dies here
+        self.assertEqual(ingest_staged_submissions(), 0)
+        StagedContactSubmission.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(ingest_staged_submissions(), 1)
+        self.assertEqual(ContactFormSubmission.objects.get().last_name, "Lovelace")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ContactSubmissionTestCase(TestCase):
+
+    def create(self, email, **fields):
+        return ContactFormSubmission.objects.create(customer_email=email, first_name="Ada", last_name="Lovelace",
+                                                    **fields)
+
+    def test_submission_upserts_profile_in_one_statement(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch('frostapi.signals.invalidate_instance_caches') as invalidate:
+            submission = self.create('ada@example.com')
+        writes = [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertEqual(len(writes), 2)
+        self.assertIn('ON CONFLICT', writes[0])
+        self.assertEqual(invalidate.call_count, 1)
+        self.assertEqual(submission.client_profile.client_email, 'ada@example.com')
+        self.assertEqual(submission.client_profile.client_last_name, "Lovelace")
+
+    def test_existing_profile_is_linked_and_left_untouched(self):
+        profile = ClientProfile.objects.create(client_first_name="Augusta", client_business="Frost",
+                                               client_email='ada@example.com')
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            submission = self.create('ada@example.com')
+        self.assertEqual(submission.client_profile_id, profile.pk)
+        statements = [q['sql'] for q in queries if q['sql'].startswith(('SELECT', 'INSERT', 'UPDATE'))]
+        # profile lookup, submission slug prefix SELECT, submission INSERT
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(len([sql for sql in statements if 'frostapi_clientprofile' in sql]), 1)
+        profile.refresh_from_db()
+        self.assertEqual(profile.client_first_name, "Augusta")
+        self.assertEqual(ClientProfile.objects.count(), 1)
+
+    def test_fallback_without_on_conflict_support(self):
+        from django.db import connection
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            first = self.create('ada@example.com')
+            second = self.create('ada@example.com')
+        self.assertEqual(first.client_profile_id, second.client_profile_id)
+        self.assertEqual(ClientProfile.objects.count(), 1)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    CONTACT_ROUTING={'booking': 'bookings@example.com', 'press': 'press@example.com'},
+    CONTACT_DEFAULT_INBOX='info@example.com',
+    CONTACT_DIGEST_INBOXES=['info@example.com'],
+)
+class NotificationTestCase(TestCase):
+
+    def submit(self, subject, email='ada@example.com'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ContactFormSubmission.objects.create(customer_email=email, subject=subject, first_name="Ada",
+                                                        last_name="Lovelace", message="Hello")
+
+    def send(self):
+        call_command('send_notifications', once=True, stdout=StringIO())
+
+    def test_subject_routes_inbox_mail_and_confirms_to_customer(self):
+        from django.core import mail
+        self.submit("Booking for June")
+        self.assertEqual(len(mail.outbox), 0)  # nothing is sent in the request
+        self.send()
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['ada@example.com', 'bookings@example.com'])
+        inbox = next(m for m in mail.outbox if m.to == ['bookings@example.com'])
+        self.assertEqual(inbox.reply_to, ['ada@example.com'])
+        self.assertFalse(EmailNotification.objects.exclude(status=EmailNotification.StatusChoices.SENT).exists())
+
+    def test_digest_inbox_gets_one_message_per_interval(self):
+        from django.core import mail
+        for n in range(3):
+            self.submit(f"Question {n}", email=f"guest{n}@example.com")
+        self.send()
+        self.assertEqual(len(mail.outbox), 3)  # confirmations only; the digest window is still open
+        mail.outbox.clear()
+
+        EmailNotification.objects.update(run_after=timezone.now())
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['info@example.com'])
+        self.assertIn("3 new messages", mail.outbox[0].subject)
+
+    def test_failures_back_off_then_give_up(self):
+        from .notifications import NotificationDispatcher
+        self.submit("Press enquiry", email='')
+        notification = EmailNotification.objects.get()
+        connection = mock.Mock(**{'send_messages.side_effect': OSError("connection refused")})
+        with override_settings(NOTIFICATION_MAX_ATTEMPTS=2):
+            self.assertEqual(NotificationDispatcher(connection).dispatch(), (0, 1))
+            notification.refresh_from_db()
+            self.assertEqual(notification.status, EmailNotification.StatusChoices.PENDING)
+            self.assertGreater(notification.run_after, timezone.now())
+
+            EmailNotification.objects.update(run_after=timezone.now())
+            NotificationDispatcher(connection).dispatch()
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, EmailNotification.StatusChoices.FAILED)
+        self.assertEqual(notification.last_error, "connection refused")
+
+    def test_notification_left_processing_by_a_dead_worker_is_resent(self):
+        from django.core import mail
+        from .notifications import claim_notifications
+        self.submit("Press enquiry", email='')
+        claim_notifications()  # the worker dies before sending
+        self.send()
+        self.assertEqual(len(mail.outbox), 0)
+
+        EmailNotification.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailNotification.objects.get().status, EmailNotification.StatusChoices.SENT)
+
+
+class BulkAdminActionTestCase(CachedAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass')
+        self.admin = Client()
+        self.admin.force_login(admin_user)
+        self.profile = ClientProfile.objects.create(client_last_name="Frost", client_business="Frost",
+                                                    client_email="venue@example.com")
+
+    def run_action(self, model_name, action, objects, **extra):
+        from .caching import invalidate_collections
+        with mock.patch('frostapi.caching.invalidate_collections', wraps=invalidate_collections) as invalidate, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.admin.post(reverse(f'admin:frostapi_{model_name}_changelist'), {
+                'action': action, '_selected_action': [obj.pk for obj in objects], **extra,
+            })
+        self.assertEqual(response.status_code, 302)
+        return invalidate.call_count
+
+    def test_mark_read_is_one_update_and_one_invalidation(self):
+        submissions = [ContactFormSubmission.objects.create(client_profile=self.profile, first_name=f"Guest {n}")
+                       for n in range(5)]
+        self.assertEqual(self.run_action('contactformsubmission', 'mark_read', submissions), 1)
+        self.assertEqual(ContactFormSubmission.objects.filter(message_read=True).count(), 5)
+
+    def test_archive_past_events_hides_them_from_the_list(self):
+        today = timezone.localdate()
+        past = EventData.objects.create(event_name="Last Year", event_date=today - timedelta(days=365),
+                                       client_profile=self.profile)
+        upcoming = EventData.objects.create(event_name="Next Week", event_date=today + timedelta(days=7),
+                                           client_profile=self.profile)
+        listed = self.client.get(reverse('event_data_list'), **self.authenticate())
+        self.assertEqual(len(listed.json()), 2)
+
+        self.assertEqual(self.run_action('eventdata', 'archive_past_events', [past, upcoming]), 1)
+        self.assertEqual(list(EventData.objects.filter(archived=True)), [past])
+        response = self.client.get(reverse('event_data_list'), **self.authenticate())
+        self.assertEqual([e['event_name'] for e in response.json()], ["Next Week"])
+        detail = self.client.get(reverse('event_data_detail', kwargs={'slug': past.slug}), **self.authenticate())
+        self.assertEqual(detail.status_code, 200)
+
+    def test_toggle_gallery_position_swaps_both_ways(self):
+        top = GalleryData.objects.create(gallery_media_title="Top", gallery_position=GalleryData.EventChoices.SLIDER_TOP)
+        bottom = GalleryData.objects.create(gallery_media_title="Bottom",
+                                            gallery_position=GalleryData.EventChoices.SLIDER_BOTTOM)
+        self.assertEqual(self.run_action('gallerydata', 'toggle_position', [top, bottom]), 1)
+        top.refresh_from_db()
+        bottom.refresh_from_db()
+        self.assertEqual(top.gallery_position, GalleryData.EventChoices.SLIDER_BOTTOM)
+        self.assertEqual(bottom.gallery_position, GalleryData.EventChoices.SLIDER_TOP)
+
+    def test_bulk_delete_invalidates_once(self):
+        events = [EventData.objects.create(event_name=f"Show {n}", client_profile=self.profile) for n in range(4)]
+        self.assertEqual(self.run_action('eventdata', 'delete_selected', events, post='yes'), 1)
+        self.assertFalse(EventData.objects.exists())
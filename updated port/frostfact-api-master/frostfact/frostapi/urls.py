@@ -10,6 +10,7 @@ urlpatterns = [
     path('contact-fsf/<slug:slug>/', ContactFormApiView.as_view(), name='cont_form_data'),
     path('event-fst/<slug:slug>/', EventApiView.as_view(), name='event_data_detail'),
     path('event-fst/', EventApiView.as_view(), name='event_data_list'),
+    path('event-occurrences/', EventOccurrenceApiView.as_view(), name='event_occurrence_list'),
     path('client-data/', ClientApiView.as_view(), name='client_data_list'),
     path('client-data/<slug:slug>/', ClientApiView.as_view(), name='client_data_detail'),
     path('faq-data/', FaqApiView.as_view(), name='faq_list'),
@@ -5,45 +5,44 @@ from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.exceptions import AuthenticationFailed, ValidationError
-from base64 import b64decode
 from .serializers import *
 from django.core.exceptions import SuspiciousOperation
 import logging
-from django.contrib.auth.models import User
+from django.conf import settings
+from .ingestion import stage_contact_submission
 from django.http import JsonResponse
-from rest_framework.exceptions import APIException
+from rest_framework.exceptions import APIException, NotFound, ParseError
+from calendar import monthrange
+from datetime import date, timedelta
+from django.db.models import Prefetch, Q
+from .recurrence import expand_occurrences, get_hot_window, get_materialized_horizon
+from urllib.parse import urlencode
+from django.utils import timezone
 from django.middleware.csrf import get_token
+from .pagination import KeysetCursorPagination, StandardPagination
+from .caching import (
+    EMPTY_CACHE_TTL, RESPONSE_CACHE_TTL, build_response, get_collection_version, get_not_modified_response,
+    get_object_prefix, get_or_compute, get_payload_timeout, get_queryset_cache_key, get_response_cache_key,
+    get_slug_cache_key, make_etag, render_payload, version_last_modified,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Caching utility for signals
-def get_cache_key(model_name):
-    return f'{model_name}_queryset'
-
-
 # CacheMixin for handling get/set cache logic
 class CacheMixin:
     @staticmethod
     def get_or_set_cache(cache_key, queryset_func, timeout=60 * 60 * 24):
+        """Cached list of `queryset_func()`. Empty results are cached as well, for EMPTY_CACHE_TTL seconds."""
         logger.debug(f"Attempting to get cache for key: {cache_key}")
+
+        def load():
+            logger.info(f"Cache miss for key: {cache_key}")
+            return list(queryset_func())
+
         try:
-            queryset = cache.get(cache_key)
-            if queryset is None:
-                logger.info(f"Cache miss for key: {cache_key}")
-                queryset = list(queryset_func())
-                if not queryset:
-                    logger.warning(f"No data found for {cache_key}.")
-                    raise ValidationError(f"No data found for {cache_key}.")
-                cache.set(cache_key, queryset, timeout=timeout)
-                logger.info(f"Cache set for key: {cache_key} with timeout {timeout} seconds.")
-            else:
-                logger.info(f"Cache hit for key: {cache_key}")
-            return queryset
-        except ValidationError as e:
-            error_message = ', '.join(e.detail) if isinstance(e.detail, list) else str(e.detail)
-            logger.error(f"Validation error: {error_message}")
-            raise SuspiciousOperation(error_message)
+            # No stale fallback here: a response rendered from an old list would be cached under the new version
+            return get_or_compute(cache_key, load, timeout=lambda items: timeout if items else EMPTY_CACHE_TTL)
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
             raise SuspiciousOperation(f"An unexpected error occurred: {str(e)}")
@@ -56,48 +55,30 @@ class CacheMixin:
 class BaseAuthenticatedView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_credentials(self, request):
-        """Extract and decode credentials from the Authorization header."""
-        try:
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Basic '):
-                encoded_credentials = auth_header.split(' ')[1]
-                decoded_credentials = b64decode(encoded_credentials).decode('utf-8')
-                username, password = decoded_credentials.split(':')
-                return username, password
-            return None, None
-        except (ValueError, IndexError, Exception) as e:
-            logger.error(f"Error decoding credentials: {e}")
-            raise AuthenticationFailed("Invalid or malformed credentials provided.")
-
     def authenticate(self, request):
-        """Authenticate the user using basic auth credentials."""
-        try:
-            username, password = self.get_credentials(request)
-            if not username or not password:
-                raise AuthenticationFailed('Invalid credentials: Username and password required.')
-
-            user = User.objects.get(username=username)
-            if not user.check_password(password):
-                raise AuthenticationFailed('Invalid username or password.')
-        except User.DoesNotExist:
-            logger.warning(f"Authentication failed: User '{username}' does not exist.")
-            raise AuthenticationFailed('Invalid username or password.')
-        except Exception as e:
-            logger.error(f"Unexpected error during authentication: {e}")
-            raise APIException('An error occurred during authentication.')
+        """Ensure the configured DRF authentication classes accepted the request."""
+        if not request.user or not request.user.is_authenticated:
+            raise AuthenticationFailed('Invalid credentials: Username and password required.')
+
+    def get_detail_queryset(self):
+        """Queryset detail lookups run against: one indexed query per object, never the cached list."""
+        return self.queryset.all()
+
+    def get_response_data(self, slug=None):
+        """Serialize either the single instance matching `slug` or the whole queryset."""
+        if slug:
+            instance = get_object_or_404(self.get_detail_queryset(), slug=slug)
+            serializer = self.get_serializer(instance)
+        else:
+            instances = self.get_queryset()
+            serializer = self.get_serializer(instances, many=True)
+        return serializer.data
 
     def get(self, request, slug=None, *args, **kwargs):
         """Handle GET requests with optional slug."""
         try:
             self.authenticate(request)
-            if slug:
-                instance = get_object_or_404(self.get_queryset(), slug=slug)
-                serializer = self.get_serializer(instance)
-            else:
-                instances = self.get_queryset()
-                serializer = self.get_serializer(instances, many=True)
-            return Response(serializer.data)
+            return Response(self.get_response_data(slug))
         except AuthenticationFailed as af:
             logger.warning(f"Authentication failed in GET request: {af}")
             return Response({"success": False, "error": str(af)}, status=401)
@@ -121,9 +102,6 @@ class BaseAuthenticatedView(generics.GenericAPIView):
                 # Save the serializer and pass the CSRF token to be saved in the model
                 serializer.save(csrf_token=csrf_token)
 
-                # Perform any additional create logic
-                self.perform_create(serializer)
-
                 # Return success response with CSRF token included
                 return Response({
                     "success": True,
@@ -157,14 +135,109 @@ class BaseAuthenticatedView(generics.GenericAPIView):
 # BaseCachedListView with caching support
 class BaseCachedListView(CacheMixin, BaseAuthenticatedView, generics.ListCreateAPIView):
     cache_key_prefix = ""
+    pagination_class = StandardPagination
+    paginate_by_default = False  # Otherwise only paginate when ?page= or ?cursor= is given
+    cursor_ordering = None  # Ordering for ?cursor= keyset pagination; None disables cursor mode
+    local_cache = False  # Also keep rendered responses in the worker's in-process LRU (hot, rarely written)
+
+    @property
+    def paginator(self):
+        """Cursor paginator for `?cursor=`, page-number paginator when enabled, otherwise None."""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if self.cursor_ordering and 'cursor' in params:
+                self._paginator = KeysetCursorPagination(ordering=self.cursor_ordering)
+            elif self.pagination_class and (self.paginate_by_default or 'page' in params):
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = None
+        return self._paginator
 
     def get_cache_key(self):
-        return f"{self.cache_key_prefix}_queryset"
+        return get_queryset_cache_key(self.cache_key_prefix)
 
     def get_queryset(self):
         cache_key = self.get_cache_key()
         return self.get_or_set_cache(cache_key, lambda: self.queryset.all())
 
+    def get_page_queryset(self):
+        """Uncached, ordered queryset that paginated requests read a single page of."""
+        return self.queryset.all()
+
+    def get_response_data(self, slug=None):
+        """Paginated lists hit the database for one page only; everything else goes through the cached list."""
+        if slug is None and self.paginator is not None:
+            page = self.paginate_queryset(self.get_page_queryset())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
+        return super().get_response_data(slug)
+
+    def get_response_variant(self, slug=None):
+        """Identify which rendering of the collection a request asks for (detail slug plus query string)."""
+        return f"{slug or ''}?{self.request.query_params.urlencode()}"
+
+    def get_object_pk(self, slug):
+        """Resolve a detail slug through the shared slug → pk map, falling back to one indexed query."""
+        key = get_slug_cache_key(self.cache_key_prefix, slug)
+        pk = cache.get(key)
+        if pk is None:
+            pk = self.get_detail_queryset().filter(slug=slug).values_list('pk', flat=True).first()
+            if pk is None:
+                raise NotFound()
+            cache.set(key, pk, timeout=RESPONSE_CACHE_TTL)
+        return pk
+
+    def get_object_data(self, pk, slug):
+        """Serialize one object by primary key; a stale slug map entry falls back to the slug lookup."""
+        instance = self.get_detail_queryset().filter(pk=pk).first()
+        if instance is None or instance.slug != slug:
+            cache.delete(get_slug_cache_key(self.cache_key_prefix, slug))
+            instance = self.get_detail_queryset().filter(slug=slug).first()
+            if instance is None:
+                raise NotFound()
+        return self.get_serializer(instance).data
+
+    def render_response_payload(self, cache_key, slug, etag, last_modified, pk=None):
+        logger.info(f"Response cache miss for key: {cache_key}")
+        data = self.get_object_data(pk, slug) if pk is not None else self.get_response_data(slug)
+        return render_payload(data, etag, last_modified)
+
+    def get(self, request, slug=None, *args, **kwargs):
+        """Serve the rendered JSON bytes from cache, or a 304 when the client already holds the current version."""
+        if request.accepted_renderer.format != 'json':
+            return super().get(request, slug, *args, **kwargs)
+        try:
+            self.authenticate(request)
+            variant = self.get_response_variant(slug)
+            # Detail responses are versioned per object, so an edit elsewhere in the collection keeps them
+            pk = self.get_object_pk(slug) if slug else None
+            prefix = get_object_prefix(self.cache_key_prefix, pk) if slug else self.cache_key_prefix
+            version = get_collection_version(prefix, local=self.local_cache)
+            etag = make_etag(prefix, version, variant)
+            last_modified = version_last_modified(version)
+            not_modified = get_not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            cache_key = get_response_cache_key(prefix, version, variant)
+            payload = get_or_compute(
+                cache_key,
+                lambda: self.render_response_payload(cache_key, slug, etag, last_modified, pk),
+                timeout=get_payload_timeout,
+                stale_key=get_response_cache_key(prefix, 'stale', variant),
+                local=self.local_cache,
+            )
+            return build_response(payload)
+        except AuthenticationFailed as af:
+            logger.warning(f"Authentication failed in GET request: {af}")
+            return Response({"success": False, "error": str(af)}, status=401)
+        except APIException:
+            # Bad query parameters, missing pages etc. already carry their own status code
+            raise
+        except Exception as e:
+            logger.error(f"Error in GET request: {e}")
+            raise APIException("An error occurred while processing the GET request.")
+
 # Define each view by extending BaseCachedListView and setting the appropriate serializer, queryset, and cache key prefix
 def get_csrf_token(request):
     try:
@@ -178,72 +251,194 @@ class ContactFormApiView(BaseCachedListView):
     serializer_class = ContactFormSerializer
     queryset = ContactFormSubmission.objects.all()
     cache_key_prefix = 'contact_form'
+    paginate_by_default = True
+    cursor_ordering = '-time_stamp'
+
+    def get_page_queryset(self):
+        return self.queryset.order_by('-time_stamp', '-pk')
+
+    def post(self, request, *args, **kwargs):
+        """With CONTACT_FORM_ASYNC_INGEST, validate and stage the submission (one insert) and answer 202."""
+        if not settings.CONTACT_FORM_ASYNC_INGEST:
+            return super().post(request, *args, **kwargs)
+        try:
+            self.authenticate(request)
+            csrf_token = get_token(request)
+            serializer = self.get_serializer(data=request.data)
+            if not serializer.is_valid():
+                logger.warning(f"POST validation failed: {serializer.errors}")
+                return Response({"success": False, "errors": serializer.errors}, status=400)
+            staged = stage_contact_submission(serializer.validated_data, csrf_token)
+            return Response({"success": True, "queued": staged.pk, "csrf_token": csrf_token}, status=202)
+        except AuthenticationFailed as af:
+            logger.warning(f"Authentication failed in POST request: {af}")
+            return Response({"success": False, "error": str(af)}, status=401)
+        except Exception as e:
+            logger.error(f"Error in POST request: {e}")
+            raise APIException("An error occurred while processing the POST request.")
 
 class HeroImageApiView(BaseCachedListView):
     serializer_class = HeroImageDataSerializer
     queryset = HeroImage.objects.filter(hero_image_live=True)
     cache_key_prefix = 'hero_image'
+    local_cache = True
 
 
 class EventApiView(BaseCachedListView):
+    """
+    Events, optionally narrowed for the calendar:
+    `?start=YYYY-MM-DD&end=YYYY-MM-DD`, `?month=YYYY-MM` (or a month name/number), `?type=Music`,
+    `?venue=...` and `?upcoming=N` (next N events from today). Filtered requests query the
+    (event_date, event_type) index directly and are cached per normalized window.
+    """
     serializer_class = EventDataSerializer
-    queryset = EventData.objects.all()
+    queryset = EventData.objects.filter(archived=False)
     cache_key_prefix = 'event_data'
+    cursor_ordering = 'event_date'
+    max_upcoming = 100
+
+    def get_detail_queryset(self):
+        # Archived events leave the lists but their pages stay reachable
+        return EventData.objects.all()
+
+    def get_event_filters(self):
+        """Parse the calendar query parameters into `(lookups, upcoming_limit)`."""
+        params = self.request.query_params
+        lookups = {}
+        limit = None
+        try:
+            month = params.get('month')
+            if month and '-' in month:
+                first = date.fromisoformat(f'{month}-01')
+                lookups['event_date__gte'] = first
+                lookups['event_date__lte'] = first.replace(day=monthrange(first.year, first.month)[1])
+            elif month:
+                month_names = dict(EventData.MONTH_CHOICES)
+                name = month_names[int(month)] if month.isdigit() else month.capitalize()
+                if name not in month_names.values():
+                    raise ValueError(month)
+                lookups['event_month'] = name
+            if params.get('start'):
+                start = date.fromisoformat(params['start'])
+                lookups['event_date__gte'] = max(start, lookups.get('event_date__gte', start))
+            if params.get('end'):
+                end = date.fromisoformat(params['end'])
+                lookups['event_date__lte'] = min(end, lookups.get('event_date__lte', end))
+            if params.get('type'):
+                if params['type'] not in EventData.EventTypeChoices.values:
+                    raise ValueError(params['type'])
+                lookups['event_type'] = params['type']
+            if params.get('venue'):
+                lookups['event_venue__iexact'] = params['venue']
+            if params.get('upcoming'):
+                limit = min(int(params['upcoming']), self.max_upcoming)
+                if limit < 1:
+                    raise ValueError(limit)
+                today = timezone.localdate()
+                lookups['event_date__gte'] = max(today, lookups.get('event_date__gte', today))
+        except (ValueError, KeyError):
+            raise ParseError("Invalid event filter. Use start/end=YYYY-MM-DD, month=YYYY-MM, type, venue or upcoming=N.")
+        if limit and ('page' in params or 'cursor' in params):
+            # upcoming=N already is the whole result; a sliced queryset can't be paginated further
+            raise ParseError("upcoming=N can't be combined with page or cursor.")
+        return lookups, limit
+
+    def get_filtered_queryset(self):
+        lookups, limit = self.get_event_filters()
+        queryset = self.queryset.filter(**lookups).order_by('event_date', 'event_time', 'pk')
+        return queryset[:limit] if limit else queryset
+
+    def get_page_queryset(self):
+        return self.get_filtered_queryset()
+
+    def get_response_data(self, slug=None):
+        lookups, limit = self.get_event_filters()
+        if slug is None and self.paginator is None and (lookups or limit):
+            return self.get_serializer(self.get_filtered_queryset(), many=True).data
+        return super().get_response_data(slug)
+
+    def get_response_variant(self, slug=None):
+        """Normalize filters so equivalent windows (e.g. month=2025-03 vs start/end) share one cache entry."""
+        lookups, limit = self.get_event_filters()
+        if slug or not (lookups or limit):
+            return super().get_response_variant(slug)
+        window = '&'.join(f'{key}={value}' for key, value in sorted(lookups.items()))
+        paging = sorted((k, v) for k, v in self.request.query_params.items() if k in ('page', 'page_size', 'cursor'))
+        return f"?{window}&limit={limit}&{urlencode(paging)}"
 
 
 class ClientApiView(BaseCachedListView):
+    """
+    Client profiles, paginated. `?ordering=` accepts the fields in `ordering_fields` (prefix `-` to
+    reverse) and `?expand=contact_forms,events` picks the nested collections (`?expand=` for none).
+    Each nested collection is one prefetch query with a column projection, so a page costs the same
+    number of queries however many clients it holds.
+    """
     serializer_class = ClientProfileSerializer
-    queryset = ClientProfile.objects.prefetch_related('contact_submissions', 'events')
+    queryset = ClientProfile.objects.all()
     cache_key_prefix = 'client_data'
+    paginate_by_default = True
+    cursor_ordering = 'pk'
+    default_ordering = 'client_last_name'
+    ordering_fields = ('client_last_name', 'client_first_name', 'client_business', 'client_email', 'pk')
 
     def get_ordering(self):
-        """Retrieve the ordering parameter with a fallback."""
-        try:
-            ordering = self.request.query_params.get('ordering', 'start_datetime')
-            if not ordering:
-                raise ValueError("Ordering parameter is missing.")
-            return ordering
-        except Exception as e:
-            logger.error(f"Error fetching ordering parameter: {e}")
-            raise APIException("Invalid ordering parameter.")  # Return a proper API error
+        ordering = self.request.query_params.get('ordering') or self.default_ordering
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise ParseError(f"Invalid ordering. Choose from: {', '.join(self.ordering_fields)}.")
+        return ordering
+
+    def get_expand(self):
+        """Nested collections to render: all of them unless `?expand=` narrows the list."""
+        expandable = self.serializer_class.expandable_fields
+        if 'expand' not in self.request.query_params:
+            return expandable
+        expand = tuple(name for name in self.request.query_params['expand'].split(',') if name)
+        unknown = set(expand) - set(expandable)
+        if unknown:
+            raise ParseError(f"Cannot expand {', '.join(sorted(unknown))}. Choose from: {', '.join(expandable)}.")
+        return expand
+
+    def get_prefetches(self):
+        """Prefetch only the columns the nested summary serializers render, plus the foreign key to join on."""
+        nested = self.serializer_class._declared_fields
+        return {
+            name: Prefetch(
+                name,
+                queryset=nested[name].child.Meta.model.objects
+                .only('client_profile', *nested[name].child.Meta.fields)
+                .order_by(*ordering),
+            )
+            for name, ordering in (('contact_forms', ('-time_stamp', '-pk')), ('events', ('event_date', 'pk')))
+        }
 
-    def get_cache_key(self):
-        """Generate cache key based on the ordering."""
-        try:
-            ordering = self.get_ordering()
-            return f"{self.cache_key_prefix}_queryset_{ordering}"
-        except Exception as e:
-            logger.error(f"Error generating cache key: {e}")
-            raise APIException("Failed to generate cache key.")  # Propagate as an API error
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
 
     def get_queryset(self):
-        """Use cached queryset with ordering."""
-        try:
-            cache_key = self.get_cache_key()
-            return self.get_or_set_cache(
-                cache_key,
-                lambda: self.queryset.order_by(self.get_ordering())
-            )
-        except FieldError as fe:
-            logger.error(f"Invalid field used for ordering: {fe}")
-            raise APIException("Invalid field specified for ordering.")
-        except ImproperlyConfigured as ic:
-            logger.error(f"Configuration error: {ic}")
-            raise APIException("Server configuration error.")
-        except Exception as e:
-            logger.error(f"Error fetching queryset: {e}")
-            raise APIException("An error occurred while retrieving data.")
+        prefetches = self.get_prefetches()
+        return self.queryset.prefetch_related(*(prefetches[name] for name in self.get_expand()))
+
+    def get_detail_queryset(self):
+        return self.get_queryset()
+
+    def get_page_queryset(self):
+        return self.get_queryset().order_by(self.get_ordering(), 'pk')
 
 class PolicyApiView(BaseCachedListView):
     serializer_class = PolicyDataSerializer
     queryset = PolicyData.objects.all()
     cache_key_prefix = 'policy_data'
+    local_cache = True
 
 
 class FaqApiView(BaseCachedListView):
     serializer_class = FaqDataSerializer
     queryset = FAQData.objects.all()
     cache_key_prefix = 'faq_data'
+    local_cache = True
 
 
 class GalleryApiView(BaseCachedListView):
@@ -256,9 +451,56 @@ class TextSliderTopApiView(BaseCachedListView):
     serializer_class = TextSliderTopSerializer
     queryset = TextSliderTop.objects.filter(active_text=True)
     cache_key_prefix = 'text_slider_top'
+    local_cache = True
 
 
 class TextSliderBottomApiView(BaseCachedListView):
     serializer_class = TextSliderBottomSerializer
     queryset = TextSliderBottom.objects.filter(active_text=True)
     cache_key_prefix = 'text_slider_bottom'
+    local_cache = True
+
+
+class EventOccurrenceApiView(BaseCachedListView):
+    """
+    Calendar occurrences for `?start=YYYY-MM-DD&end=YYYY-MM-DD` (default: the next 30 days).
+
+    Windows inside the materialized horizon are one indexed range scan on EventOccurrence; anything
+    else is expanded from the recurrence rules on demand.
+    """
+    serializer_class = EventOccurrenceSerializer
+    queryset = EventOccurrence.objects.select_related('event').filter(event__archived=False)
+    cache_key_prefix = 'event_occurrences'
+    default_window_days = 30
+    max_window_days = 366
+
+    def get_window(self):
+        params = self.request.query_params
+        try:
+            start = date.fromisoformat(params['start']) if params.get('start') else timezone.localdate()
+            end = date.fromisoformat(params['end']) if params.get('end') else start + timedelta(days=self.default_window_days)
+        except ValueError:
+            raise ParseError("Invalid window. Use start/end=YYYY-MM-DD.")
+        if end < start or (end - start).days > self.max_window_days:
+            raise ParseError(f"The window must be between 0 and {self.max_window_days} days long.")
+        return start, end
+
+    def get_response_data(self, slug=None):
+        start, end = self.get_window()
+        hot_start, _ = get_hot_window()
+        horizon = get_materialized_horizon()
+        if horizon and hot_start <= start and end <= horizon:
+            occurrences = self.queryset.filter(occurrence_date__range=(start, end))
+        else:
+            events = EventData.objects.filter(archived=False).filter(
+                Q(recurrence_rule__gt='', event_date__lte=end) | Q(event_date__range=(start, end))
+            )
+            occurrences = [
+                EventOccurrence(event=event, occurrence_date=day, occurrence_time=event.event_time)
+                for event, day in expand_occurrences(events, start, end)
+            ]
+        return self.get_serializer(occurrences, many=True).data
+
+    def get_response_variant(self, slug=None):
+        start, end = self.get_window()
+        return f"{start}:{end}"
@@ -60,6 +60,9 @@ AWS_S3_OBJECT_PARAMETERS = {
 }
 AWS_S3_REGION_NAME = str(os.getenv("AWS_S3_REGION_NAME"))
 AWS_S3_FILE_OVERWRITE = False
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', 20))  # Shared client pool size
+AWS_S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024  # Uploads above this size go multipart
+AWS_S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
 AWS_DEFAULT_ACL = None
 
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
@@ -200,6 +203,12 @@ else:
     CACHE_MIDDLEWARE_SECONDS = 300  # Cache timeout for 5 minutes
 
 CACHE_TTL = 60 * 60 * 24  # Cache timeout set to 24 hours
+EMPTY_CACHE_TTL = 60 * 5  # Empty collections are cached too, with a shorter timeout
+LOCAL_CACHE_MAXSIZE = int(os.getenv('LOCAL_CACHE_MAXSIZE', 256))  # Hot responses kept per worker process
+LOCAL_CACHE_VERSION_TTL = int(os.getenv('LOCAL_CACHE_VERSION_TTL', 2))  # Seconds a worker trusts its version memo
+EVENT_OCCURRENCE_HORIZON_DAYS = 90  # Days ahead kept in the EventOccurrence table
+AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 300))  # Seconds a verified Basic credential skips check_password
+AUTH_CACHE_MAXSIZE = int(os.getenv('AUTH_CACHE_MAXSIZE', 256))  # Credentials kept per worker process
 INSTALLED_APPS = [
     "admin_interface",
     "colorfield",
@@ -234,6 +243,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
+    'frostapi.caching.batched_invalidation_middleware',
 
 ]
 
@@ -278,6 +288,7 @@ AUTH_PASSWORD_VALIDATORS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'frostapi.authentication.CustomHeaderAuthentication',
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',  # Bearer tokens, no DB lookup
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -287,6 +298,13 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10
 }
 
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_MINUTES', 15))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.getenv('JWT_REFRESH_DAYS', 1))),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'UPDATE_LAST_LOGIN': False,
+}
+
 API_TOKEN_USER_AUTH_KEY = os.environ.get('API_TOKEN_USER_AUTH_KEY')
 API_TOKEN_USER_AUTH_VALUE = os.environ.get('API_TOKEN_USER_AUTH_VALUE')
 
@@ -316,7 +334,45 @@ STATICFILES_DIRS = [
 logger.info(f"Connecting to the database with URL: {DATABASE_URL}")
 MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/{MEDIAFILES_LOCATION}/'
 
-# MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
+
+# Storage for uploaded images; set to django.core.files.storage.FileSystemStorage to keep them under MEDIA_ROOT locally
+IMAGE_STORAGE_BACKEND = os.getenv('IMAGE_STORAGE_BACKEND', 'frostapi.storage.CustomS3Boto3Storage')
+if IMAGE_STORAGE_BACKEND == 'django.core.files.storage.FileSystemStorage':
+    MEDIA_URL = '/media/'
+IMAGE_DERIVATIVE_FORMATS = ['avif', 'webp', 'jpeg']  # Formats Pillow can't encode here are skipped
+IMAGE_DERIVATIVE_WIDTHS = {}  # Per-model width ladders, e.g. {'GalleryData': [320, 640, 960]}
+IMAGE_JOB_MAX_ATTEMPTS = 5  # Attempts before an image job is marked failed
+IMAGE_JOB_RETRY_BACKOFF = 30  # Seconds before the first retry, doubled on each further attempt
+QUEUE_LEASE_SECONDS = 60 * 10  # A queue row still processing after this is reclaimed (its worker died)
+
+# Stage contact-form POSTs (202 Accepted) for the ingest_contact_forms worker instead of inserting in the request
+CONTACT_FORM_ASYNC_INGEST = os.getenv('CONTACT_FORM_ASYNC_INGEST', 'False') == 'True'
+CONTACT_INGEST_MAX_ATTEMPTS = 5  # Attempts before a staged submission is marked failed
+
+# Outgoing mail, sent by the send_notifications worker. For a local debugging server run
+# `python -m aiosmtpd -n -l localhost:1025` with EMAIL_PORT=1025, or set EMAIL_BACKEND to the console/file backend.
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Frost Factory <no-reply@frostfactorybk.com>')
+
+# Contact form routing: the first keyword found in the submission subject picks the inbox
+CONTACT_ROUTING = {
+    'booking': 'bookings@frostfactorybk.com',
+    'rental': 'bookings@frostfactorybk.com',
+    'event': 'events@frostfactorybk.com',
+    'press': 'press@frostfactorybk.com',
+}
+CONTACT_DEFAULT_INBOX = os.getenv('CONTACT_DEFAULT_INBOX', 'info@frostfactorybk.com')
+CONTACT_DIGEST_INBOXES = []  # High-volume inboxes that get one digest per interval instead of one mail per message
+CONTACT_DIGEST_INTERVAL = 60 * 15  # Seconds
+NOTIFICATION_MAX_ATTEMPTS = 5  # Attempts before a notification is marked failed
+NOTIFICATION_RETRY_BACKOFF = 60  # Seconds before the first retry, doubled on each further attempt
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 